@@ -0,0 +1,67 @@
+"""article_search_vector
+
+Revision ID: 3c1f8a2d9b47
+Revises: e4a9ab728141
+Create Date: 2026-10-18 10:12:41.208311
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f8a2d9b47'
+down_revision: Union[str, Sequence[str], None] = 'e4a9ab728141'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_EXPRESSION = (
+	"setweight(to_tsvector('english', coalesce(title, '')), 'A')"
+	" || setweight(to_tsvector('english', coalesce(content, '')), 'B')"
+	" || setweight(to_tsvector('english', article_tags_text(tags)), 'C')"
+)
+
+
+def upgrade() -> None:
+	"""Upgrade schema."""
+	# array_to_string is only STABLE, generated columns need IMMUTABLE
+	op.execute(
+		"""
+		CREATE OR REPLACE FUNCTION article_tags_text(tags text[])
+		RETURNS text
+		LANGUAGE sql
+		IMMUTABLE
+		PARALLEL SAFE
+		AS $$ SELECT coalesce(array_to_string(tags, ' '), '') $$
+		"""
+	)
+	op.add_column(
+		'articles',
+		sa.Column(
+			'search_vector',
+			postgresql.TSVECTOR(),
+			sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+			nullable=True,
+		),
+	)
+	op.create_index(
+		'ix_articles_search_vector',
+		'articles',
+		['search_vector'],
+		unique=False,
+		postgresql_using='gin',
+	)
+
+
+def downgrade() -> None:
+	"""Downgrade schema."""
+	op.drop_index(
+		'ix_articles_search_vector',
+		table_name='articles',
+		postgresql_using='gin',
+	)
+	op.drop_column('articles', 'search_vector')
+	op.execute('DROP FUNCTION IF EXISTS article_tags_text(text[])')
@@ -0,0 +1,90 @@
+"""search_predicate_indexes
+
+Revision ID: 7d2e4b6a1f93
+Revises: 3c1f8a2d9b47
+Create Date: 2026-10-18 14:03:52.617024
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e4b6a1f93'
+down_revision: Union[str, Sequence[str], None] = '3c1f8a2d9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, options)
+INDEXES = [
+	(
+		'ix_articles_published_created_at',
+		'articles',
+		['created_at', 'id'],
+		{'postgresql_where': sa.text("status = 'published'")},
+	),
+	('ix_articles_author_id', 'articles', ['author_id'], {}),
+	('ix_articles_category_id', 'articles', ['category_id'], {}),
+	('ix_articles_tags', 'articles', ['tags'], {'postgresql_using': 'gin'}),
+	('ix_users_role_id', 'users', ['role_id'], {}),
+	(
+		'ix_users_is_active_created_at',
+		'users',
+		['is_active', 'created_at', 'id'],
+		{},
+	),
+]
+
+# (name, table, column) searched with ILIKE '%...%'
+TRGM_INDEXES = [
+	('ix_articles_title_trgm', 'articles', 'title'),
+	('ix_users_full_name_trgm', 'users', 'full_name'),
+	('ix_users_username_trgm', 'users', 'username'),
+	('ix_users_email_trgm', 'users', 'email'),
+	('ix_categories_name_trgm', 'categories', 'name'),
+]
+
+
+def upgrade() -> None:
+	"""Upgrade schema."""
+	op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+	# CONCURRENTLY keeps the tables writable while the indexes build
+	with op.get_context().autocommit_block():
+		for name, table, columns, options in INDEXES:
+			op.create_index(
+				name,
+				table,
+				columns,
+				unique=False,
+				postgresql_concurrently=True,
+				if_not_exists=True,
+				**options,
+			)
+		for name, table, column in TRGM_INDEXES:
+			op.create_index(
+				name,
+				table,
+				[column],
+				unique=False,
+				postgresql_using='gin',
+				postgresql_ops={column: 'gin_trgm_ops'},
+				postgresql_concurrently=True,
+				if_not_exists=True,
+			)
+
+
+def downgrade() -> None:
+	"""Downgrade schema."""
+	with op.get_context().autocommit_block():
+		names = [(name, table) for name, table, *_ in INDEXES]
+		names += [(name, table) for name, table, _ in TRGM_INDEXES]
+		for name, table in reversed(names):
+			op.drop_index(
+				name,
+				table_name=table,
+				postgresql_concurrently=True,
+				if_exists=True,
+			)
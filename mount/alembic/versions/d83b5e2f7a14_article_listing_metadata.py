@@ -0,0 +1,38 @@
+"""article_listing_metadata
+
+Revision ID: d83b5e2f7a14
+Revises: c61f0e9a4d58
+Create Date: 2026-10-18 19:12:08.514203
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd83b5e2f7a14'
+down_revision: Union[str, Sequence[str], None] = 'c61f0e9a4d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+	"""Upgrade schema."""
+	# Nullable so the migration is instant, existing rows are filled by
+	# the `backfill` CLI command.
+	op.add_column('articles', sa.Column('excerpt', sa.Text(), nullable=True))
+	op.add_column(
+		'articles', sa.Column('word_count', sa.Integer(), nullable=True)
+	)
+	op.add_column(
+		'articles', sa.Column('reading_time', sa.Integer(), nullable=True)
+	)
+
+
+def downgrade() -> None:
+	"""Downgrade schema."""
+	op.drop_column('articles', 'reading_time')
+	op.drop_column('articles', 'word_count')
+	op.drop_column('articles', 'excerpt')
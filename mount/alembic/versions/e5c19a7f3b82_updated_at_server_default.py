@@ -0,0 +1,39 @@
+"""updated_at_server_default
+
+Revision ID: e5c19a7f3b82
+Revises: d83b5e2f7a14
+Create Date: 2026-10-18 20:03:27.146592
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c19a7f3b82'
+down_revision: Union[str, Sequence[str], None] = 'd83b5e2f7a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Created before BaseModel had a server default for updated_at
+TABLES = ['roles', 'users', 'categories', 'articles']
+
+
+def upgrade() -> None:
+	"""Upgrade schema."""
+	# updated_at is the version checked by optimistic updates, so every
+	# row needs one
+	for table in TABLES:
+		op.alter_column(table, 'updated_at', server_default=sa.text('now()'))
+		op.execute(
+			f'UPDATE {table} SET updated_at = created_at '
+			'WHERE updated_at IS NULL'
+		)
+
+
+def downgrade() -> None:
+	"""Downgrade schema."""
+	for table in TABLES:
+		op.alter_column(table, 'updated_at', server_default=None)
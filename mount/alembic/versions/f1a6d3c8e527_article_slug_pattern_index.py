@@ -0,0 +1,44 @@
+"""article_slug_pattern_index
+
+Revision ID: f1a6d3c8e527
+Revises: e5c19a7f3b82
+Create Date: 2026-10-18 20:41:09.372815
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a6d3c8e527'
+down_revision: Union[str, Sequence[str], None] = 'e5c19a7f3b82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+	"""Upgrade schema."""
+	# The unique index on slug uses the database collation, which cannot
+	# serve LIKE 'prefix%'. text_pattern_ops compares bytewise and can.
+	with op.get_context().autocommit_block():
+		op.create_index(
+			'ix_articles_slug_pattern',
+			'articles',
+			['slug'],
+			unique=False,
+			postgresql_ops={'slug': 'text_pattern_ops'},
+			postgresql_concurrently=True,
+			if_not_exists=True,
+		)
+
+
+def downgrade() -> None:
+	"""Downgrade schema."""
+	with op.get_context().autocommit_block():
+		op.drop_index(
+			'ix_articles_slug_pattern',
+			table_name='articles',
+			postgresql_concurrently=True,
+			if_exists=True,
+		)
@@ -1,5 +1,7 @@
 from fastapi import APIRouter
 
+from .admin_articles import router as admin_articles_router
+from .admin_system import router as admin_system_router
 from .admin_users import router as admin_users_router
 from .ai_agent import router as agent_router
 from .articles import router as articles_router
@@ -13,5 +15,7 @@ router.include_router(users_router, tags=['Users'])
 router.include_router(admin_users_router, tags=['Admin-users'])
 router.include_router(roles_router, tags=['Roles'])
 router.include_router(articles_router, tags=['Articles'])
+router.include_router(admin_articles_router, tags=['Admin-articles'])
 router.include_router(categories_router, tags=['Categories'])
 router.include_router(agent_router, tags=['AI Agent'])
+router.include_router(admin_system_router, tags=['Admin-system'])
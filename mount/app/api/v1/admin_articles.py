@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.enums.roles import RoleEnum
+from app.schemas import StandardResponse
+from app.schemas.articles import ArticleBulkRequest
+from app.services.auth_dependency import rbac_required
+from app.services.connection import get_db
+from app.usecases import articles as article_usecase
+from app.utils.responses import standard_response
+
+router = APIRouter(prefix='/admin/articles')
+
+
+@router.post(
+	'/bulk',
+	response_model=StandardResponse,
+	description='<h1>Only for Admin</h1> action: archive, delete',
+)
+async def bulk_articles(
+	bulk_in: ArticleBulkRequest,
+	user: StandardResponse = Depends(
+		rbac_required([RoleEnum.ADMIN.value], sensitive=True)
+	),
+	db: AsyncSession = Depends(get_db),
+):
+	user_status_code, user_success, user_message, user_data = user
+	if not user_success:
+		return standard_response(
+			user_status_code, user_success, user_message, user_data
+		)
+
+	(
+		status_code,
+		success,
+		message,
+		data,
+	) = await article_usecase.bulk_articles(
+		bulk_in.ids, bulk_in.action.value, db
+	)
+	return standard_response(status_code, success, message, data)
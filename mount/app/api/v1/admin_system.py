@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+
+from app.enums.roles import RoleEnum
+from app.schemas import StandardResponse
+from app.services.auth_dependency import rbac_required
+from app.usecases import system as system_usecase
+from app.utils.responses import standard_response
+
+router = APIRouter(prefix='/admin/system')
+
+
+@router.get(
+	'/db-pool',
+	response_model=StandardResponse,
+	description='<h1>Only for Admin</h1> Pool of the worker that answers',
+)
+async def db_pool_stats(
+	user: StandardResponse = Depends(rbac_required([RoleEnum.ADMIN.value])),
+):
+	user_status_code, user_success, user_message, user_data = user
+	if not user_success:
+		return standard_response(
+			user_status_code, user_success, user_message, user_data
+		)
+
+	status_code, success, message, data = await system_usecase.pool_stats()
+	return standard_response(status_code, success, message, data)
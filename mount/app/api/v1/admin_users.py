@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.enums.pagination import CountMode
 from app.enums.roles import RoleEnum
 from app.schemas import StandardResponse
 from app.schemas.users import NewPasswordRequest
@@ -21,6 +22,8 @@ async def search_users(
 	is_active: bool = True,
 	page: int = 1,
 	limit: int = 10,
+	count: CountMode = Query(CountMode.EXACT),
+	cursor: str = None,
 	user: StandardResponse = Depends(rbac_required([RoleEnum.ADMIN.value])),
 	db: AsyncSession = Depends(get_db),
 ):
@@ -36,7 +39,7 @@ async def search_users(
 		message,
 		user_data,
 	) = await users_usecases.search(
-		key, role.value, is_active, page, limit, db
+		key, role.value, is_active, page, limit, db, count.value, cursor
 	)
 	return standard_response(status_code, success, message, user_data)
 
@@ -44,7 +47,9 @@ async def search_users(
 @router.patch('/status/{user_id}')
 async def user_status_change(
 	user_id: int,
-	user: StandardResponse = Depends(rbac_required([RoleEnum.ADMIN.value])),
+	user: StandardResponse = Depends(
+		rbac_required([RoleEnum.ADMIN.value], sensitive=True)
+	),
 	db: AsyncSession = Depends(get_db),
 ):
 	user_status_code, user_success, user_message, user_data = user
@@ -66,7 +71,9 @@ async def user_status_change(
 async def user_password_change(
 	user_id: int,
 	new_password: NewPasswordRequest,
-	user: StandardResponse = Depends(rbac_required([RoleEnum.ADMIN.value])),
+	user: StandardResponse = Depends(
+		rbac_required([RoleEnum.ADMIN.value], sensitive=True)
+	),
 	db: AsyncSession = Depends(get_db),
 ):
 	user_status_code, user_success, user_message, user_data = user
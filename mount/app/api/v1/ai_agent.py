@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.enums.roles import RoleEnum
 from app.schemas import StandardResponse
-from app.services.auth_dependency import logged_in
+from app.services.auth_dependency import logged_in, rbac_required
 from app.services.connection import get_db
 from app.usecases import agent_usecase
 from app.utils.responses import standard_response
@@ -27,6 +29,136 @@ async def article_analysis(
 		success,
 		message,
 		data,
-	) = await agent_usecase.get_from_ai(db=db, id=article_id)
+	) = await agent_usecase.get_from_ai(
+		db=db, id=article_id, user_id=user_data['data']['id']
+	)
 
 	return standard_response(status_code, success, message, data)
+
+
+@router.get(
+	'/{article_id}/stream',
+	description='Server-Sent Events stream of the analysis as it is generated',
+)
+async def article_analysis_stream(
+	article_id: int,
+	db: AsyncSession = Depends(get_db),
+	user: StandardResponse = Depends(logged_in),
+):
+	user_status_code, user_success, user_message, user_data = user
+	if not user_success:
+		return standard_response(
+			user_status_code, user_success, user_message, user_data
+		)
+
+	(
+		status_code,
+		success,
+		message,
+		data,
+	) = await agent_usecase.get_from_ai_stream(
+		db=db, id=article_id, user_id=user_data['data']['id']
+	)
+	if not success:
+		return standard_response(status_code, success, message, data)
+
+	return StreamingResponse(
+		data,
+		media_type='text/event-stream',
+		headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+	)
+
+
+@router.get(
+	'/cache/stats',
+	response_model=StandardResponse,
+	description='<h1>Only for Admin</h1>',
+)
+async def analysis_cache_stats(
+	user: StandardResponse = Depends(rbac_required([RoleEnum.ADMIN.value])),
+):
+	user_status_code, user_success, user_message, user_data = user
+	if not user_success:
+		return standard_response(
+			user_status_code, user_success, user_message, user_data
+		)
+
+	status_code, success, message, data = await agent_usecase.cache_stats()
+	return standard_response(status_code, success, message, data)
+
+
+@router.post('/{article_id}/jobs', response_model=StandardResponse)
+async def create_analysis_job(
+	article_id: int,
+	db: AsyncSession = Depends(get_db),
+	user: StandardResponse = Depends(logged_in),
+):
+	user_status_code, user_success, user_message, user_data = user
+	if not user_success:
+		return standard_response(
+			user_status_code, user_success, user_message, user_data
+		)
+
+	(
+		status_code,
+		success,
+		message,
+		data,
+	) = await agent_usecase.create_analysis_job(
+		db=db, id=article_id, user_id=user_data['data']['id']
+	)
+
+	return standard_response(status_code, success, message, data)
+
+
+@router.get('/jobs/{job_id}', response_model=StandardResponse)
+async def get_analysis_job(
+	job_id: str,
+	user: StandardResponse = Depends(logged_in),
+):
+	user_status_code, user_success, user_message, user_data = user
+	if not user_success:
+		return standard_response(
+			user_status_code, user_success, user_message, user_data
+		)
+
+	(
+		status_code,
+		success,
+		message,
+		data,
+	) = await agent_usecase.get_analysis_job(job_id, user_data['data'])
+
+	return standard_response(status_code, success, message, data)
+
+
+@router.get(
+	'/jobs/{job_id}/events',
+	description='Server-Sent Events stream of the job status and result',
+)
+async def analysis_job_events(
+	job_id: str,
+	request: Request,
+	user: StandardResponse = Depends(logged_in),
+):
+	user_status_code, user_success, user_message, user_data = user
+	if not user_success:
+		return standard_response(
+			user_status_code, user_success, user_message, user_data
+		)
+
+	# Same ownership check as the polling endpoint before streaming
+	(
+		status_code,
+		success,
+		message,
+		data,
+	) = await agent_usecase.get_analysis_job(job_id, user_data['data'])
+	if not success:
+		return standard_response(status_code, success, message, data)
+
+	return StreamingResponse(
+		agent_usecase.analysis_job_events(job_id, request),
+		media_type='text/event-stream',
+		headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+	)
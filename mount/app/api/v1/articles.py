@@ -1,24 +1,38 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.enums.articles import ArticleView, SearchMode
+from app.enums.pagination import CountMode
 from app.schemas import StandardResponse
 from app.schemas.articles import ArticleRequest, ArticleUpdate
 from app.services.auth_dependency import logged_in
-from app.services.connection import get_db
+from app.services.connection import get_db, get_read_db
 from app.usecases import articles as article_usecase
 from app.utils.responses import standard_response
 
 router = APIRouter(prefix='/articles')
 
 
-@router.get('/', response_model=StandardResponse)
+@router.get(
+	'/',
+	response_model=StandardResponse,
+	description='mode: fulltext, substring<br>count: exact, estimated, auto'
+	'<br>cursor: next_cursor / prev_cursor of a previous page'
+	'<br>view: summary (listing columns and an excerpt), full'
+	'<br>fields: comma separated summary columns, e.g. id,title,excerpt',
+)
 async def search_articles(
 	keys: str = '',
 	category: str = None,
 	tag: str = None,
 	limit: int = 10,
 	offset: int = 0,
-	db: AsyncSession = Depends(get_db),
+	mode: SearchMode = Query(SearchMode.FULLTEXT),
+	count: CountMode = Query(CountMode.EXACT),
+	cursor: str = None,
+	view: ArticleView = Query(ArticleView.SUMMARY),
+	fields: str = None,
+	db: AsyncSession = Depends(get_read_db),
 ):
 	(
 		status_code,
@@ -31,6 +45,11 @@ async def search_articles(
 		tag=tag,
 		limit=limit,
 		offset=offset,
+		mode=mode.value,
+		count_mode=count.value,
+		cursor=cursor,
+		view=view.value,
+		fields=fields,
 		db=db,
 	)
 	return standard_response(status_code, success, message, data)
@@ -66,7 +85,7 @@ async def create_article(
 @router.get('/{id}', response_model=StandardResponse)
 async def get_articles(
 	id: int,
-	db: AsyncSession = Depends(get_db),
+	db: AsyncSession = Depends(get_read_db),
 	user: StandardResponse = Depends(logged_in),
 ):
 	user_status_code, user_success, user_message, user_data = user
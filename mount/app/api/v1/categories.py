@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.enums.pagination import CountMode
 from app.enums.roles import RoleEnum
 from app.schemas import StandardResponse
 from app.schemas.categories import CategoryRequest
 from app.services.auth_dependency import rbac_required
-from app.services.connection import get_db
+from app.services.connection import get_db, get_read_db
 from app.usecases import categories as categories_usecase
 from app.utils.responses import standard_response
 
@@ -17,14 +18,17 @@ async def search(
 	category: str = '',
 	page: int = 1,
 	limit: int = 20,
-	db: AsyncSession = Depends(get_db),
+	count: CountMode = Query(CountMode.EXACT),
+	db: AsyncSession = Depends(get_read_db),
 ):
 	(
 		status_code,
 		success,
 		message,
 		data,
-	) = await categories_usecase.search(category, db, page, limit)
+	) = await categories_usecase.search(
+		category, db, page, limit, count_mode=count.value
+	)
 	return standard_response(status_code, success, message, data)
 
 
@@ -49,7 +53,9 @@ async def create_category(
 
 
 @router.get('/{category_id}', response_model=StandardResponse)
-async def get_category(category_id: int, db: AsyncSession = Depends(get_db)):
+async def get_category(
+	category_id: int, db: AsyncSession = Depends(get_read_db)
+):
 	(
 		status_code,
 		success,
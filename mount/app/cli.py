@@ -2,23 +2,97 @@ import asyncio
 
 import typer
 
+from app.enums.articles import SearchMode
+from app.repositories.article_repo import ArticleRepository
+from app.repositories.category_repo import CategoryRepository
+from app.repositories.user_repo import UserRepository
 from app.seed.articles_seeder import seed_articles
 from app.seed.categories_seeder import seed_categories
 from app.seed.roles_seeder import seed_roles
 from app.services.config import config
 from app.services.connection import sessionmanager
+from app.utils.helpers import article_metadata
 
 cli = typer.Typer()
 
 
 async def run_seed(func):
-	sessionmanager.init(config.db_dsn)
+	sessionmanager.init(config.db_dsn, **config.db_engine_options)
 	async with sessionmanager.session() as session:
 		await func(session)
 		await session.commit()
 	await sessionmanager.close()
 
 
+async def run_explain(keys: str, tag: str, category: str, role: str):
+	sessionmanager.init(config.db_dsn, **config.db_engine_options)
+	async with sessionmanager.session() as session:
+		article_repo = ArticleRepository(session)
+		category_repo = CategoryRepository(session)
+		user_repo = UserRepository(session)
+
+		fulltext_query, fulltext_keys = article_repo.search_query(
+			keys, category, tag, SearchMode.FULLTEXT.value
+		)
+		substring_query, substring_keys = article_repo.search_query(
+			keys, category, tag, SearchMode.SUBSTRING.value
+		)
+		user_query, user_keys = user_repo.search_query(keys, role, True)
+		category_query = category_repo.search_query(keys)
+
+		plans = [
+			(
+				'articles fulltext page',
+				article_repo.keyset_query(fulltext_query, fulltext_keys),
+			),
+			(
+				'articles fulltext count',
+				article_repo.count_query(fulltext_query),
+			),
+			(
+				'articles substring page',
+				article_repo.keyset_query(substring_query, substring_keys),
+			),
+			('users page', user_repo.keyset_query(user_query, user_keys)),
+			('users count', user_repo.count_query(user_query)),
+			('categories page', category_query),
+			('categories count', category_repo.count_query(category_query)),
+		]
+		for name, query in plans:
+			plan = await article_repo.explain(query.limit(10))
+			print(f'[+] {name}')
+			print(plan)
+			print()
+	await sessionmanager.close()
+
+
+async def run_backfill(batch_size: int, missing_only: bool):
+	sessionmanager.init(config.db_dsn, **config.db_engine_options)
+	async with sessionmanager.session() as session:
+		article_repo = ArticleRepository(session)
+		last_id = 0
+		total = 0
+		while True:
+			rows = await article_repo.content_batch(
+				last_id, batch_size, missing_only
+			)
+			if not rows:
+				break
+			await article_repo.save_metadata(
+				[
+					{'id': row.id, **article_metadata(row.content)}
+					for row in rows
+				]
+			)
+			# Drop the batch from the identity map before the next one
+			session.expunge_all()
+			last_id = rows[-1].id
+			total += len(rows)
+			print(f'[+] Backfilled {total} articles, last id {last_id}.')
+	await sessionmanager.close()
+	print(f'[+] Article metadata backfill done, {total} articles updated.')
+
+
 @cli.command()
 def roles():
 	asyncio.run(run_seed(seed_roles))
@@ -34,5 +108,28 @@ def articles():
 	asyncio.run(run_seed(seed_articles))
 
 
+@cli.command()
+def explain(
+	keys: str = 'news',
+	tag: str = None,
+	category: str = None,
+	role: str = 'user',
+):
+	"""
+	Print EXPLAIN ANALYZE plans of the repository search queries.
+	"""
+	asyncio.run(run_explain(keys, tag, category, role))
+
+
+@cli.command()
+def backfill(batch_size: int = 500, all_rows: bool = False):
+	"""
+	Store the excerpt, word count and reading time of existing articles,
+	in id order batches of `batch_size`. Only articles without metadata
+	are processed unless --all-rows is given.
+	"""
+	asyncio.run(run_backfill(batch_size, not all_rows))
+
+
 if __name__ == '__main__':
 	cli()
@@ -5,3 +5,18 @@ class ArticleStatus(Enum):
 	PUBLISHED = 'published'
 	DRAFT = 'draft'
 	ARCHIVED = 'archived'
+
+
+class ArticleView(Enum):
+	SUMMARY = 'summary'
+	FULL = 'full'
+
+
+class SearchMode(Enum):
+	FULLTEXT = 'fulltext'
+	SUBSTRING = 'substring'
+
+
+class BulkAction(Enum):
+	ARCHIVE = 'archive'
+	DELETE = 'delete'
@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class JobStatus(Enum):
+	QUEUED = 'queued'
+	RUNNING = 'running'
+	SUCCEEDED = 'succeeded'
+	FAILED = 'failed'
+
+
+class JobBackend(Enum):
+	POSTGRES = 'postgres'
+	MEMORY = 'memory'
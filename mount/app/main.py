@@ -16,6 +16,7 @@ from .services.exceeptions import (
 	validation_exception_handler,
 )
 from .services.lifespan import lifespan
+from .services.read_your_writes import read_your_writes_middleware
 
 app = FastAPI(
 	title='Content Curation API',
@@ -50,6 +51,7 @@ app.add_exception_handler(Exception, general_exception_handler)
 
 # Add middleware
 app.middleware('http')(catch_exceptions_middleware)
+app.middleware('http')(read_your_writes_middleware)
 
 
 @app.get('/', tags=['DB Health Check'])
@@ -2,3 +2,5 @@ from .users import User
 from .roles import Role
 from .articles import Article
 from .categories import Category
+from .analyses import ArticleAnalysis
+from .jobs import AnalysisJob
@@ -0,0 +1,33 @@
+from sqlalchemy import (
+	Column,
+	ForeignKey,
+	Integer,
+	String,
+	Text,
+	UniqueConstraint,
+)
+
+from .base import BaseModel
+
+
+class ArticleAnalysis(BaseModel):
+	__tablename__ = 'article_analyses'
+	__table_args__ = (
+		UniqueConstraint(
+			'article_id',
+			'content_hash',
+			name='uq_article_analyses_article_id_content_hash',
+		),
+	)
+
+	id = Column(Integer, primary_key=True, autoincrement=True)
+	article_id = Column(
+		Integer, ForeignKey('articles.id', ondelete='CASCADE'), nullable=False
+	)
+	# sha256 of the prompt version and the analysed content
+	content_hash = Column(String(64), nullable=False)
+	prompt_version = Column(String(16), nullable=False)
+	analysis_report = Column(Text, nullable=False)
+
+	def __repr__(self):
+		return f'<ArticleAnalysis(id={self.id}, article_id={self.article_id})>'
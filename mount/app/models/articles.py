@@ -1,12 +1,64 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import ARRAY, TEXT
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+	Column,
+	Computed,
+	ForeignKey,
+	Index,
+	Integer,
+	String,
+	Text,
+	text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, TEXT, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
 from .base import BaseModel
 
+# Text search configuration used for both the stored vector and the queries.
+SEARCH_CONFIG = 'english'
+
+# Listing metadata stored alongside the content, see `article_metadata`
+EXCERPT_CHARS = 200
+WORDS_PER_MINUTE = 200
+
+# Kept in sync with the generated column created by the
+# `article_search_vector` migration. `article_tags_text` is an IMMUTABLE
+# wrapper around array_to_string so it can be used in a generated column.
+SEARCH_VECTOR_EXPRESSION = (
+	f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A')"
+	f" || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'B')"
+	f" || setweight(to_tsvector('{SEARCH_CONFIG}', article_tags_text(tags)), 'C')"
+)
+
 
 class Article(BaseModel):
 	__tablename__ = 'articles'
+	__table_args__ = (
+		Index(
+			'ix_articles_search_vector',
+			'search_vector',
+			postgresql_using='gin',
+		),
+		Index(
+			'ix_articles_published_created_at',
+			'created_at',
+			'id',
+			postgresql_where=text("status = 'published'"),
+		),
+		Index('ix_articles_tags', 'tags', postgresql_using='gin'),
+		Index(
+			'ix_articles_title_trgm',
+			'title',
+			postgresql_using='gin',
+			postgresql_ops={'title': 'gin_trgm_ops'},
+		),
+		# Prefix matches on slug, see BaseRepository.slug_usage
+		Index(
+			'ix_articles_slug_pattern',
+			'slug',
+			postgresql_ops={'slug': 'text_pattern_ops'},
+		),
+	)
+
 	id = Column(Integer, primary_key=True, autoincrement=True)
 	title = Column(String, nullable=False)
 	slug = Column(String, nullable=False, unique=True)
@@ -18,10 +70,24 @@ class Article(BaseModel):
 	thumb_image = Column(String, nullable=True)
 	cover_image = Column(String, nullable=True)
 
-	author_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+	# Derived from content on every write so listings never read it
+	excerpt = Column(Text, nullable=True)
+	word_count = Column(Integer, nullable=True)
+	reading_time = Column(Integer, nullable=True)  # minutes
+
+	# Maintained by postgres, never loaded unless explicitly asked for
+	search_vector = deferred(
+		Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True))
+	)
+
+	author_id = Column(
+		Integer, ForeignKey('users.id'), nullable=False, index=True
+	)
 	author = relationship('User', back_populates='articles')
 
-	category_id = Column(Integer, ForeignKey('categories.id'), nullable=False)
+	category_id = Column(
+		Integer, ForeignKey('categories.id'), nullable=False, index=True
+	)
 	category = relationship('Category', back_populates='articles')
 
 	def __repr__(self):
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from .base import BaseModel
@@ -6,6 +6,14 @@ from .base import BaseModel
 
 class Category(BaseModel):
 	__tablename__ = 'categories'
+	__table_args__ = (
+		Index(
+			'ix_categories_name_trgm',
+			'name',
+			postgresql_using='gin',
+			postgresql_ops={'name': 'gin_trgm_ops'},
+		),
+	)
 
 	id = Column(Integer, primary_key=True)
 	name = Column(String(100), unique=True, nullable=False)
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Text
+
+from app.enums.jobs import JobStatus
+
+from .base import BaseModel
+
+
+class AnalysisJob(BaseModel):
+	__tablename__ = 'analysis_jobs'
+	__table_args__ = (
+		# Startup recovery only looks for jobs that did not finish
+		Index(
+			'ix_analysis_jobs_unfinished',
+			'created_at',
+			postgresql_where="status IN ('queued', 'running')",
+		),
+	)
+
+	id = Column(String(36), primary_key=True)
+	article_id = Column(
+		Integer, ForeignKey('articles.id', ondelete='CASCADE'), nullable=False
+	)
+	user_id = Column(
+		Integer,
+		ForeignKey('users.id', ondelete='CASCADE'),
+		nullable=False,
+		index=True,
+	)
+	status = Column(String(16), nullable=False, default=JobStatus.QUEUED.value)
+	analysis_report = Column(Text, nullable=True)
+	error = Column(Text, nullable=True)
+
+	def __repr__(self):
+		return f'<AnalysisJob(id={self.id}, status={self.status})>'
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from .base import BaseModel
@@ -6,6 +6,29 @@ from .base import BaseModel
 
 class User(BaseModel):
 	__tablename__ = 'users'
+	__table_args__ = (
+		Index(
+			'ix_users_is_active_created_at', 'is_active', 'created_at', 'id'
+		),
+		Index(
+			'ix_users_full_name_trgm',
+			'full_name',
+			postgresql_using='gin',
+			postgresql_ops={'full_name': 'gin_trgm_ops'},
+		),
+		Index(
+			'ix_users_username_trgm',
+			'username',
+			postgresql_using='gin',
+			postgresql_ops={'username': 'gin_trgm_ops'},
+		),
+		Index(
+			'ix_users_email_trgm',
+			'email',
+			postgresql_using='gin',
+			postgresql_ops={'email': 'gin_trgm_ops'},
+		),
+	)
 
 	id = Column(Integer, primary_key=True, autoincrement=True)
 	username = Column(String(50), unique=True, nullable=False)
@@ -15,7 +38,7 @@ class User(BaseModel):
 	photo = Column(String, nullable=True)
 	is_active = Column(Boolean, default=True, nullable=False)
 
-	role_id = Column(Integer, ForeignKey('roles.id'))
+	role_id = Column(Integer, ForeignKey('roles.id'), index=True)
 
 	role = relationship('Role', back_populates='users')
 
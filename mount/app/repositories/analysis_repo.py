@@ -0,0 +1,73 @@
+from typing import Optional
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models import ArticleAnalysis
+
+from .base_repo import BaseRepository
+
+
+class AnalysisRepository(BaseRepository[ArticleAnalysis]):
+	def __init__(self, db: AsyncSession):
+		super().__init__(db, ArticleAnalysis)
+
+	async def get_report(
+		self, article_id: int, content_hash: str
+	) -> Optional[str]:
+		try:
+			query = select(ArticleAnalysis.analysis_report).filter(
+				ArticleAnalysis.article_id == article_id,
+				ArticleAnalysis.content_hash == content_hash,
+			)
+			result = await self.db.execute(query)
+			return result.scalars().first()
+		except SQLAlchemyError as e:
+			raise e
+
+	async def get_reports(
+		self, article_id: int, content_hashes: list[str]
+	) -> dict[str, str]:
+		"""
+		Stored reports of `article_id` for any of `content_hashes` in one
+		query, by content hash.
+		"""
+		try:
+			query = select(
+				ArticleAnalysis.content_hash, ArticleAnalysis.analysis_report
+			).filter(
+				ArticleAnalysis.article_id == article_id,
+				ArticleAnalysis.content_hash.in_(content_hashes),
+			)
+			result = await self.db.execute(query)
+			return dict(result.all())
+		except SQLAlchemyError as e:
+			raise e
+
+	async def save_report(
+		self,
+		article_id: int,
+		content_hash: str,
+		prompt_version: str,
+		analysis_report: str,
+	):
+		try:
+			query = (
+				insert(ArticleAnalysis)
+				.values(
+					article_id=article_id,
+					content_hash=content_hash,
+					prompt_version=prompt_version,
+					analysis_report=analysis_report,
+				)
+				.on_conflict_do_nothing(
+					constraint='uq_article_analyses_article_id_content_hash'
+				)
+			)
+			await self.db.execute(query)
+			await self.db.commit()
+		except SQLAlchemyError as e:
+			await self.db.rollback()
+			raise e
@@ -1,17 +1,96 @@
+from sqlalchemy import REAL, Select, case, func, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import joinedload
 
-from app.models import Article
+from app.enums.articles import SearchMode
+from app.enums.pagination import CountMode
+from app.models import Article, User
+from app.models.articles import EXCERPT_CHARS, SEARCH_CONFIG
 
-from .base_repo import BaseRepository
+from .base_repo import BaseRepository, SearchResult
 
 
 class ArticleRepository(BaseRepository[Article]):
 	def __init__(self, db: AsyncSession):
 		super().__init__(db, Article)
 
+	def search_query(
+		self,
+		keys: str,
+		category: str = None,
+		tag: str = None,
+		mode: str = SearchMode.FULLTEXT.value,
+	) -> tuple[Select, list]:
+		"""
+		Published articles matching the filters and the keys to sort them
+		by: relevance for full-text queries, newest first otherwise.
+		"""
+		query = select(self.model).filter(self.model.status == 'published')
+		sort_keys = [self.model.created_at, self.model.id]
+		if keys is not None and len(keys) > 0:
+			if mode == SearchMode.FULLTEXT.value:
+				ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, keys)
+				rank = func.ts_rank(
+					self.model.search_vector, ts_query, type_=REAL
+				)
+				query = query.filter(
+					self.model.search_vector.op('@@')(ts_query)
+				)
+				sort_keys = [rank, self.model.id]
+			else:
+				query = query.filter(self.model.title.ilike(f'%{keys}%'))
+
+		if category:
+			query = query.filter(self.model.category.has(name=category))
+
+		if tag:
+			query = query.filter(self.model.tags.contains([tag]))
+
+		return query, sort_keys
+
+	def summary_columns(self, fields: list[str]) -> list:
+		"""
+		Columns of the summary listing for `fields`. The stored excerpt is
+		used when present, otherwise it is cut by postgres from the start
+		of the content. The content itself is never sent.
+		"""
+		head = func.left(self.model.content, EXCERPT_CHARS + 1)
+		fallback = case(
+			(func.char_length(head) <= EXCERPT_CHARS, head),
+			# Cut at the last whole word
+			else_=func.regexp_replace(
+				func.left(self.model.content, EXCERPT_CHARS), r'\s+\S*$', ''
+			)
+			+ '…',
+		)
+		# Only rows not backfilled yet read the content
+		excerpt = func.coalesce(self.model.excerpt, fallback)
+		columns = {
+			'id': self.model.id,
+			'title': self.model.title,
+			'slug': self.model.slug,
+			'status': self.model.status,
+			'tags': self.model.tags,
+			'thumb_image': self.model.thumb_image,
+			'cover_image': self.model.cover_image,
+			'excerpt': excerpt.label('excerpt'),
+			'word_count': self.model.word_count,
+			'reading_time': self.model.reading_time,
+			'author_id': self.model.author_id,
+			'category_id': self.model.category_id,
+			'created_at': self.model.created_at,
+		}
+
+		unknown = [field for field in fields if field not in columns]
+		if unknown:
+			raise ValueError(
+				f'Unknown fields: {", ".join(unknown)}. '
+				f'Available: {", ".join(columns)}'
+			)
+		return [columns[field] for field in fields]
+
 	async def search(
 		self,
 		keys: str,
@@ -19,36 +98,67 @@ class ArticleRepository(BaseRepository[Article]):
 		tag: str = None,
 		limit: int = 10,
 		offset: int = 0,
-	):
+		mode: str = SearchMode.FULLTEXT.value,
+		count_mode: str = CountMode.EXACT.value,
+		cursor: str = None,
+		fields: list[str] = None,
+	) -> SearchResult:
+		"""
+		Full articles with author and category, or only the summary
+		`fields` of each article (as dicts) when given.
+		"""
 		try:
-			query = (
-				select(self.model)
-				.join(self.model.author, isouter=True)
-				.join(self.model.category, isouter=True)
-				.options(
-					joinedload(self.model.author),
+			query, sort_keys = self.search_query(keys, category, tag, mode)
+
+			total, total_exact = await self.count(query, count_mode)
+
+			if fields:
+				query = query.with_only_columns(*self.summary_columns(fields))
+			else:
+				query = query.options(
+					joinedload(self.model.author).joinedload(User.role),
 					joinedload(self.model.category),
 				)
-				.filter(self.model.status == 'published')
+			data, next_cursor, prev_cursor = await self.keyset_paginate(
+				query, sort_keys, cursor=cursor, limit=limit, offset=offset
 			)
-			if keys is not None and len(keys) > 0:
-				query = query.filter(self.model.title.ilike(f'%{keys}%'))
-
-			if category:
-				query = query.filter(self.model.category.has(name=category))
 
-			if tag:
-				query = query.filter(self.model.tags.any(name=tag))
-
-			total_results = await self.db.execute(query)
-			total = len(total_results.unique().scalars().all())
-
-			query = query.distinct(Article.id).limit(limit).offset(offset)
+			return SearchResult(
+				total, total_exact, data, next_cursor, prev_cursor
+			)
 
-			results = await self.db.execute(query)
-			data = results.unique().scalars().all()
+		except SQLAlchemyError as e:
+			raise e
 
-			return total, data
+	async def content_batch(
+		self, after_id: int, limit: int, missing_only: bool = True
+	) -> list:
+		"""
+		Next `limit` (id, content) rows after `after_id` in id order,
+		only those without stored metadata when `missing_only`.
+		"""
+		try:
+			query = (
+				select(self.model.id, self.model.content)
+				.filter(self.model.id > after_id)
+				.order_by(self.model.id)
+				.limit(limit)
+			)
+			if missing_only:
+				query = query.filter(self.model.word_count.is_(None))
+			result = await self.db.execute(query)
+			return list(result.all())
+		except SQLAlchemyError as e:
+			raise e
 
+	async def save_metadata(self, rows: list[dict]):
+		"""
+		Writes the excerpt, word count and reading time of many articles
+		in one executemany UPDATE, each dict carrying the article id.
+		"""
+		try:
+			await self.db.execute(update(self.model), rows)
+			await self.db.commit()
 		except SQLAlchemyError as e:
+			await self.db.rollback()
 			raise e
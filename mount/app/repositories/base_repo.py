@@ -1,17 +1,243 @@
-from typing import Generic, List, Optional, Type, TypeVar
+import json
+from typing import Generic, List, NamedTuple, Optional, Type, TypeVar
 
-from sqlalchemy.exc import SQLAlchemyError
+from asyncpg import PostgresError
+from sqlalchemy import (
+	BigInteger,
+	Select,
+	and_,
+	cast,
+	delete,
+	func,
+	insert,
+	inspect,
+	tuple_,
+	update,
+)
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.enums.pagination import CountMode
+from app.services.config import config
+from app.utils.cursor import NEXT, PREV, decode_cursor, encode_cursor
+from app.utils.explain import Explain
+
 T = TypeVar('T')
 
 
+class SearchResult(NamedTuple):
+	total: int
+	total_exact: bool
+	items: list
+	next_cursor: Optional[str] = None
+	prev_cursor: Optional[str] = None
+
+
 class BaseRepository(Generic[T]):
 	def __init__(self, db: AsyncSession, model: Type[T]):
 		self.db = db
 		self.model = model
 
+	async def count(
+		self, query: Select, mode: str = CountMode.EXACT.value
+	) -> tuple[int, bool]:
+		"""
+		Counts the rows matched by `query` without loading them.
+		Returns the total and whether it is exact or a planner estimate.
+		"""
+		try:
+			query = query.order_by(None).limit(None).offset(None)
+			if mode != CountMode.EXACT.value:
+				estimate = await self.estimate_count(query)
+				if (
+					mode == CountMode.ESTIMATED.value
+					or estimate > config.COUNT_ESTIMATE_THRESHOLD
+				):
+					return estimate, False
+
+			result = await self.db.execute(self.count_query(query))
+			return result.scalar_one(), True
+		except SQLAlchemyError as e:
+			raise e
+
+	@staticmethod
+	def count_query(query: Select) -> Select:
+		query = query.order_by(None).limit(None).offset(None)
+		return select(func.count()).select_from(query.subquery())
+
+	async def estimate_count(self, query: Select) -> int:
+		"""
+		Row estimate of the planner for `query`, read from EXPLAIN.
+		"""
+		try:
+			result = await self.db.execute(Explain(query))
+			plan = result.scalar_one()
+			if isinstance(plan, str):
+				plan = json.loads(plan)
+			return int(plan[0]['Plan']['Plan Rows'])
+		except SQLAlchemyError as e:
+			raise e
+
+	async def keyset_paginate(
+		self,
+		query: Select,
+		keys: list,
+		cursor: Optional[str] = None,
+		limit: int = 10,
+		offset: int = 0,
+	) -> tuple[list, Optional[str], Optional[str]]:
+		"""
+		Pages `query` in descending order of `keys` (the last key must be
+		unique). With a cursor the page starts right after the row it
+		points at, so the database never scans skipped rows; `offset` is
+		only honoured for the first, cursor-less request.
+
+		Returns the items of the page and the cursors around it. Items are
+		the selected entity, or a dict per row when `query` selects several
+		columns.
+		"""
+		try:
+			values, direction = None, NEXT
+			if cursor:
+				values, direction = decode_cursor(cursor)
+				if len(values) != len(keys) or not all(
+					self._fits_key(key, value)
+					for key, value in zip(keys, values)
+				):
+					raise ValueError('Invalid cursor')
+			elif offset:
+				query = query.offset(offset)
+
+			selected = query.column_descriptions
+			entity = len(selected) == 1 and (
+				selected[0]['expr'] is selected[0]['entity']
+			)
+
+			query = self.keyset_query(query, keys, values, direction)
+			result = await self.db.execute(query.limit(limit + 1))
+			# Sort keys are appended after the selected columns
+			names = list(result.keys())[: len(selected)]
+			# Only joined eager loads of entities can repeat rows
+			rows = (result.unique() if entity else result).all()
+
+			has_more = len(rows) > limit
+			rows = rows[:limit]
+			if direction == PREV:
+				rows.reverse()
+			if not rows:
+				return [], None, None
+
+			has_next = has_more if direction == NEXT else True
+			has_prev = (
+				has_more if direction == PREV else bool(cursor or offset)
+			)
+			width = len(names)
+			next_cursor = (
+				encode_cursor(list(rows[-1][width:]), NEXT)
+				if has_next
+				else None
+			)
+			prev_cursor = (
+				encode_cursor(list(rows[0][width:]), PREV)
+				if has_prev
+				else None
+			)
+			if entity:
+				items = [row[0] for row in rows]
+			else:
+				items = [dict(zip(names, row[:width])) for row in rows]
+			return items, next_cursor, prev_cursor
+		except SQLAlchemyError as e:
+			raise e
+
+	@staticmethod
+	def _fits_key(key, value) -> bool:
+		"""
+		Whether a cursor value can be compared with `key`, so a tampered
+		cursor is rejected instead of failing in the database.
+		"""
+		if value is None or isinstance(value, bool):
+			return False
+		try:
+			python_type = key.type.python_type
+		except NotImplementedError:
+			return True
+		if python_type is float:
+			return isinstance(value, (int, float))
+		return isinstance(value, python_type)
+
+	@staticmethod
+	def keyset_query(
+		query: Select,
+		keys: list,
+		values: Optional[list] = None,
+		direction: str = NEXT,
+	) -> Select:
+		"""
+		Orders `query` by `keys` and, given the key of a boundary row,
+		restricts it to the rows after it in `direction`.
+		"""
+		if values is not None:
+			if direction == PREV:
+				query = query.filter(tuple_(*keys) > tuple_(*values))
+			else:
+				query = query.filter(tuple_(*keys) < tuple_(*values))
+
+		order_by = [
+			key.asc() if direction == PREV else key.desc() for key in keys
+		]
+		return query.add_columns(*keys).order_by(*order_by)
+
+	async def explain(self, query: Select, analyze: bool = True) -> str:
+		"""
+		Plan of `query` as text. With `analyze` the query is executed.
+		"""
+		try:
+			result = await self.db.execute(
+				Explain(query, analyze=analyze, format='text')
+			)
+			return '\n'.join(row[0] for row in result)
+		except SQLAlchemyError as e:
+			raise e
+
+	@staticmethod
+	def violates(error: IntegrityError, constraint: str) -> bool:
+		"""
+		Whether `error` was raised by the named constraint.
+		"""
+		cause = getattr(error.orig, '__cause__', None)
+		return getattr(cause, 'constraint_name', None) == constraint
+
+	def slug_usage_query(self, slug: str, field_name: str = 'slug') -> Select:
+		field = getattr(self.model, field_name)
+		suffix = func.substr(field, len(slug) + 2)
+		numbered = and_(
+			field.startswith(f'{slug}-', autoescape=True),
+			suffix.regexp_match('^[0-9]{1,18}$'),
+		)
+		return select(
+			func.coalesce(func.bool_or(field == slug), False),
+			func.max(cast(suffix, BigInteger)).filter(numbered),
+		).filter(field.startswith(slug, autoescape=True))
+
+	async def slug_usage(
+		self, slug: str, field_name: str = 'slug'
+	) -> tuple[bool, Optional[int]]:
+		"""
+		Whether `slug` is taken and the highest N among the taken
+		`slug-N` variants (None when there are none), in one query over
+		the rows sharing the prefix.
+		"""
+		try:
+			result = await self.db.execute(
+				self.slug_usage_query(slug, field_name)
+			)
+			taken, highest = result.one()
+			return taken, highest
+		except SQLAlchemyError as e:
+			raise e
+
 	async def get_by_field(self, field_name: str, value: any) -> Optional[T]:
 		try:
 			query = select(self.model).filter(
@@ -108,52 +334,186 @@ class BaseRepository(Generic[T]):
 			raise e
 
 	async def create_all(
-		self, data_list: List[dict], commit: bool = True
+		self,
+		data_list: List[dict],
+		commit: bool = True,
+		batch_size: Optional[int] = None,
 	) -> List[T]:
+		"""
+		Inserts `data_list` with INSERT ... RETURNING, `batch_size` rows
+		per statement, so the created objects come back with their ids and
+		server defaults without a refresh per row. Objects are returned in
+		the order of `data_list`.
+		"""
+		batch_size = batch_size or config.DB_INSERT_BATCH_SIZE
 		try:
-			items = [self.model(**data) for data in data_list]
-			self.db.add_all(items)
+			items = []
+			query = insert(self.model).returning(
+				self.model, sort_by_parameter_order=True
+			)
+			for start in range(0, len(data_list), batch_size):
+				result = await self.db.execute(
+					query, data_list[start : start + batch_size]
+				)
+				items.extend(result.scalars().all())
 			if commit:
 				await self.db.commit()
-				for item in items:
-					await self.db.refresh(item)
 			return items
 		except SQLAlchemyError as e:
 			await self.db.rollback()
 			raise e
 
-	async def update(self, item_id: str, updated_data: dict) -> Optional[T]:
+	async def copy_all(
+		self, data_list: List[dict], commit: bool = True
+	) -> int:
+		"""
+		Loads `data_list` with postgres COPY through asyncpg, the fastest
+		path for large imports. Nothing is returned but the row count;
+		columns missing from the dicts get their scalar python default or
+		the server default. Rows must all have the same keys.
+		"""
+		if not data_list:
+			return 0
+
+		table = self.model.__table__
+		defaults = {
+			column.key: column.default.arg
+			for column in table.columns
+			if column.default is not None
+			and column.default.is_scalar
+			and column.key not in data_list[0]
+		}
+		columns = [*data_list[0], *defaults]
+		records = [
+			tuple({**defaults, **data}[key] for key in columns)
+			for data in data_list
+		]
 		try:
-			result = await self.db.execute(
-				select(self.model).filter(self.model.id == item_id)
+			connection = await self.db.connection()
+			raw = await connection.get_raw_connection()
+			await raw.driver_connection.copy_records_to_table(
+				table.name, records=records, columns=columns
 			)
-			item = result.scalars().first()
-			if not item:
-				return None
+			if commit:
+				await self.db.commit()
+			return len(records)
+		except (SQLAlchemyError, PostgresError) as e:
+			await self.db.rollback()
+			raise e
 
-			for key, value in updated_data.items():
-				setattr(item, key, value)
+	async def update(
+		self,
+		item_id: str,
+		updated_data: dict,
+		conditions: Optional[dict] = None,
+		commit: bool = True,
+	) -> Optional[T]:
+		"""
+		Writes `updated_data` to the row in a single UPDATE ... RETURNING
+		and bumps its updated_at. Keys that are not columns of the model
+		are ignored. `conditions` are column values the row must still
+		have, e.g. the updated_at a client read for optimistic
+		concurrency; returns None when the row is missing or does not
+		match them. With `commit` off the caller commits, e.g. together
+		with more statements.
+		"""
+		try:
+			columns = inspect(self.model).column_attrs.keys()
+			values = {
+				key: value
+				for key, value in updated_data.items()
+				if key in columns
+			}
+			values['updated_at'] = func.now()
 
-			await self.db.commit()
-			await self.db.refresh(item)
+			query = update(self.model).filter(self.model.id == item_id)
+			for key, value in (conditions or {}).items():
+				query = query.filter(getattr(self.model, key) == value)
+			query = query.values(**values).returning(self.model)
+
+			result = await self.db.execute(query)
+			item = result.scalars().first()
+			if commit:
+				await self.db.commit()
 			return item
 		except SQLAlchemyError as e:
 			await self.db.rollback()
 			raise e
 
-	async def delete(self, field_name: str, field_value: any) -> bool:
+	async def update_many(
+		self,
+		updated_data: dict,
+		ids: Optional[list] = None,
+		criteria: Optional[list] = None,
+	) -> list:
+		"""
+		Writes `updated_data` to every row with one of `ids` and/or
+		matching all `criteria` (SQL expressions) in one UPDATE and
+		returns the ids of the rows it changed.
+		"""
 		try:
-			field = getattr(self.model, field_name)
+			values = {**updated_data, 'updated_at': func.now()}
+			query = self._bulk_filter(update(self.model), ids, criteria)
 			result = await self.db.execute(
-				select(self.model).filter(field == field_value)
+				query.values(**values).returning(self.model.id)
 			)
-			item = result.scalars().first()
-			if not item:
-				return False
+			changed = list(result.scalars().all())
+			await self.db.commit()
+			return changed
+		except SQLAlchemyError as e:
+			await self.db.rollback()
+			raise e
+
+	async def delete(
+		self,
+		field_name: str,
+		field_value: any,
+		conditions: Optional[dict] = None,
+	) -> bool:
+		"""
+		Deletes the rows where `field_name` is `field_value` (and the
+		`conditions` columns have the given values) in one DELETE ...
+		RETURNING, without loading them. Returns whether any row matched.
+		"""
+		try:
+			field = getattr(self.model, field_name)
+			query = delete(self.model).filter(field == field_value)
+			for key, value in (conditions or {}).items():
+				query = query.filter(getattr(self.model, key) == value)
 
-			await self.db.delete(item)
+			result = await self.db.execute(query.returning(self.model.id))
+			deleted = result.first() is not None
 			await self.db.commit()
-			return True
+			return deleted
 		except SQLAlchemyError as e:
 			await self.db.rollback()
 			raise e
+
+	async def delete_many(
+		self, ids: Optional[list] = None, criteria: Optional[list] = None
+	) -> list:
+		"""
+		Deletes every row with one of `ids` and/or matching all `criteria`
+		(SQL expressions) in one DELETE and returns the deleted ids.
+		"""
+		try:
+			query = self._bulk_filter(delete(self.model), ids, criteria)
+			result = await self.db.execute(query.returning(self.model.id))
+			deleted = list(result.scalars().all())
+			await self.db.commit()
+			return deleted
+		except SQLAlchemyError as e:
+			await self.db.rollback()
+			raise e
+
+	def _bulk_filter(
+		self, query, ids: Optional[list], criteria: Optional[list]
+	):
+		# Refuse to touch the whole table by accident
+		if ids is None and not criteria:
+			raise ValueError('Bulk statements need ids or criteria.')
+		if ids is not None:
+			query = query.filter(self.model.id.in_(ids))
+		if criteria:
+			query = query.filter(*criteria)
+		return query.execution_options(synchronize_session=False)
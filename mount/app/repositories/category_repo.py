@@ -1,37 +1,41 @@
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.enums.pagination import CountMode
 from app.models import Category
 
-from .base_repo import BaseRepository
+from .base_repo import BaseRepository, SearchResult
 
 
 class CategoryRepository(BaseRepository[Category]):
 	def __init__(self, db: AsyncSession):
 		super().__init__(db, Category)
 
+	def search_query(self, category: str = None) -> Select:
+		query = select(Category)
+		if category is not None and len(category) != 0:
+			query = query.filter(Category.name.ilike(f'%{category}%'))
+		return query
+
 	async def search(
 		self,
 		category: str = None,
 		offset: int = None,
 		limit: int = None,
-	):
+		count_mode: str = CountMode.EXACT.value,
+	) -> SearchResult:
 		try:
-			query = select(Category)
-
-			if category is not None and len(category) != 0:
-				query = query.filter(Category.name.ilike(f'%{category}%'))
+			query = self.search_query(category)
 
-			total_results = await self.db.execute(query)
-			total = len(total_results.unique().scalars().all())
+			total, total_exact = await self.count(query, count_mode)
 
-			query = query.distinct(Category.id).limit(limit).offset(offset)
+			query = query.order_by(Category.id).limit(limit).offset(offset)
 
 			results = await self.db.execute(query)
-			data = results.unique().scalars().all()
+			data = results.scalars().all()
 
-			return total, data
+			return SearchResult(total, total_exact, data)
 
 		except SQLAlchemyError as e:
 			raise e
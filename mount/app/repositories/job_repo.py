@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.enums.jobs import JobStatus
+from app.models import AnalysisJob
+
+from .base_repo import BaseRepository
+
+
+class JobRepository(BaseRepository[AnalysisJob]):
+	def __init__(self, db: AsyncSession):
+		super().__init__(db, AnalysisJob)
+
+	async def claim(self, job_id: str) -> bool:
+		"""
+		Moves a queued job to running. Only one worker can win the claim,
+		even when several processes enqueued the same job.
+		"""
+		try:
+			query = (
+				update(AnalysisJob)
+				.where(
+					AnalysisJob.id == job_id,
+					AnalysisJob.status == JobStatus.QUEUED.value,
+				)
+				.values(status=JobStatus.RUNNING.value, updated_at=func.now())
+				.returning(AnalysisJob.id)
+			)
+			result = await self.db.execute(query)
+			claimed = result.scalar_one_or_none() is not None
+			await self.db.commit()
+			return claimed
+		except SQLAlchemyError as e:
+			await self.db.rollback()
+			raise e
+
+	async def finish(
+		self,
+		job_id: str,
+		status: str,
+		analysis_report: Optional[str] = None,
+		error: Optional[str] = None,
+	):
+		try:
+			query = (
+				update(AnalysisJob)
+				.where(AnalysisJob.id == job_id)
+				.values(
+					status=status,
+					analysis_report=analysis_report,
+					error=error,
+					updated_at=func.now(),
+				)
+			)
+			await self.db.execute(query)
+			await self.db.commit()
+		except SQLAlchemyError as e:
+			await self.db.rollback()
+			raise e
+
+	async def recover(self, stale_before: datetime) -> List[str]:
+		"""
+		Puts jobs that have been running since before `stale_before` back
+		in the queue and returns the ids of every queued job, oldest first.
+		"""
+		try:
+			await self.db.execute(
+				update(AnalysisJob)
+				.where(
+					AnalysisJob.status == JobStatus.RUNNING.value,
+					AnalysisJob.updated_at < stale_before,
+				)
+				.values(status=JobStatus.QUEUED.value, updated_at=func.now())
+			)
+			await self.db.commit()
+
+			result = await self.db.execute(
+				select(AnalysisJob.id)
+				.filter(AnalysisJob.status == JobStatus.QUEUED.value)
+				.order_by(AnalysisJob.created_at)
+			)
+			return list(result.scalars().all())
+		except SQLAlchemyError as e:
+			await self.db.rollback()
+			raise e
@@ -1,12 +1,15 @@
-from sqlalchemy import or_
+import json
+
+from sqlalchemy import Select, func, or_
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import joinedload
 
+from app.enums.pagination import CountMode
 from app.models import Role, User
 
-from .base_repo import BaseRepository
+from .base_repo import BaseRepository, SearchResult
 
 
 class UserRepository(BaseRepository[User]):
@@ -40,6 +43,42 @@ class UserRepository(BaseRepository[User]):
 		except SQLAlchemyError as e:
 			raise e
 
+	async def get_inactive_ids(self) -> list[int]:
+		try:
+			query = select(User.id).filter(User.is_active.is_(False))
+			result = await self.db.execute(query)
+			return list(result.scalars().all())
+		except SQLAlchemyError as e:
+			raise e
+
+	async def notify(self, channel: str, payload: dict):
+		"""
+		Postgres NOTIFY on `channel`, delivered to listeners when the
+		current transaction commits.
+		"""
+		try:
+			await self.db.execute(
+				select(func.pg_notify(channel, json.dumps(payload)))
+			)
+		except SQLAlchemyError as e:
+			raise e
+
+	def search_query(
+		self, key: str, role: str, is_active: bool
+	) -> tuple[Select, list]:
+		query = select(User).filter(User.is_active == is_active)
+		if role:
+			query = query.filter(User.role.has(Role.role == role))
+		if key:
+			query = query.filter(
+				or_(
+					User.full_name.ilike(f'%{key}%'),
+					User.username.ilike(f'%{key}%'),
+					User.email.ilike(f'%{key}%'),
+				)
+			)
+		return query, [User.created_at, User.id]
+
 	async def search(
 		self,
 		key: str,
@@ -47,28 +86,24 @@ class UserRepository(BaseRepository[User]):
 		is_active: bool,
 		offset: int = None,
 		limit: int = None,
-	):
+		count_mode: str = CountMode.EXACT.value,
+		cursor: str = None,
+	) -> SearchResult:
 		try:
-			query = select(User).options(joinedload(User.role))
-			query = query.filter(User.is_active == is_active)
-			if role:
-				query = query.filter(User.role.has(Role.role == role))
-			if key:
-				query = query.filter(
-					or_(
-						User.full_name.ilike(f'%{key}%'),
-						User.username.ilike(f'%{key}%'),
-						User.email.ilike(f'%{key}%'),
-					)
-				)
+			query, sort_keys = self.search_query(key, role, is_active)
 
-			total_results = await self.db.execute(query)
-			total = len(total_results.unique().scalars().all())
+			total, total_exact = await self.count(query, count_mode)
 
-			query = query.limit(limit).offset(offset)
-			result = await self.db.execute(query)
-			data = result.unique().scalars().all()
-			return total, data
+			data, next_cursor, prev_cursor = await self.keyset_paginate(
+				query.options(joinedload(User.role)),
+				sort_keys,
+				cursor=cursor,
+				limit=limit,
+				offset=offset,
+			)
+			return SearchResult(
+				total, total_exact, data, next_cursor, prev_cursor
+			)
 		except SQLAlchemyError as e:
 			raise e
 
@@ -1,5 +1,21 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
 from .articles import ArticleOnlyResponse
 
 
 class AIAnalysis(ArticleOnlyResponse):
 	analysis_report: str
+
+
+class AnalysisJobResponse(BaseModel):
+	id: str
+	article_id: int
+	user_id: int
+	status: str
+	analysis_report: Optional[str] = None
+	error: Optional[str] = None
+	created_at: Optional[datetime] = None
+	updated_at: Optional[datetime] = None
@@ -1,8 +1,9 @@
+from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from app.enums.articles import ArticleStatus
+from app.enums.articles import ArticleStatus, BulkAction
 
 from .categories import CategoryResponse
 from .users import UserResponse
@@ -30,9 +31,17 @@ class ArticleUpdate(BaseModel):
 	thumb_image: Optional[str] = None
 	cover_image: Optional[str] = None
 	category_id: Optional[int] = None
+	# The updated_at the client read, the update is rejected if the
+	# article changed since
+	updated_at: Optional[datetime] = None
 
 	class Config:
-		form_attributes = True
+		from_attributes = True
+
+
+class ArticleBulkRequest(BaseModel):
+	ids: List[int] = Field(min_length=1, max_length=1000)
+	action: BulkAction
 
 
 class ArticleOnlyResponse(BaseModel):
@@ -44,6 +53,9 @@ class ArticleOnlyResponse(BaseModel):
 	tags: List[str]
 	thumb_image: Optional[str]
 	cover_image: Optional[str]
+	word_count: Optional[int] = None
+	reading_time: Optional[int] = None
+	updated_at: Optional[datetime] = None
 
 
 class ArticleWithCatId(ArticleOnlyResponse):
@@ -55,4 +67,4 @@ class ArticleResponse(ArticleOnlyResponse):
 	category: CategoryResponse = None
 
 	class Config:
-		form_attributes = True
+		from_attributes = True
@@ -10,4 +10,4 @@ class CategoryResponse(BaseModel):
 	name: str
 
 	class Config:
-		form_attributes = True
+		from_attributes = True
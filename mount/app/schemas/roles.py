@@ -5,4 +5,4 @@ class RoleResponse(BaseModel):
 	role: str
 
 	class Config:
-		form_attributes = True
+		from_attributes = True
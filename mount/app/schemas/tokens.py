@@ -11,3 +11,4 @@ class TokenData(BaseModel):
 	full_name: Optional[str] = None
 	photo: Optional[str] = None
 	role: Optional[str] = None
+	iat: Optional[int] = None
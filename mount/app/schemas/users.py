@@ -27,7 +27,7 @@ class UserUpdate(BaseModel):
 	photo: Optional[str] = ''
 
 	class Config:
-		form_attributes = True
+		from_attributes = True
 
 
 class UserResponse(BaseModel):
@@ -40,7 +40,7 @@ class UserResponse(BaseModel):
 	role: Optional[RoleResponse] = None
 
 	class Config:
-		form_attributes = True
+		from_attributes = True
 
 
 class UserWithRoleId(BaseModel):
@@ -51,7 +51,7 @@ class UserWithRoleId(BaseModel):
 	role_id: int
 
 	class Config:
-		form_attributes = True
+		from_attributes = True
 
 
 class LoginRequest(BaseModel):
@@ -4,6 +4,7 @@ import os
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.articles import Article
+from app.utils.helpers import article_metadata
 
 
 async def seed_articles(session: AsyncSession):
@@ -32,6 +33,7 @@ async def seed_articles(session: AsyncSession):
 				cover_image='',
 				author_id=1,
 				category_id=article_category_id,
+				**article_metadata(article_content),
 			)
 
 			session.add(new_article)
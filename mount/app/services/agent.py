@@ -1,28 +1,29 @@
+import hashlib
 import os
+from typing import AsyncIterator
 
 from dotenv import load_dotenv
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_groq import ChatGroq
 
+from app.services.config import config
+from app.utils.concurrency import ConcurrencyLimiter
+
 load_dotenv()
 
 os.environ['GROQ_API_KEY']
 
 
+MODEL_NAME = 'llama3-70b-8192'
+
 llm = ChatGroq(
-	model_name='llama3-70b-8192',
+	model_name=MODEL_NAME,
 	temperature=0.3,
 )
 
 
-prompt = ChatPromptTemplate.from_messages(
-	[
-		(
-			'user',
-			"""
-Given the following content, provide:
-
+REPORT_FORMAT = """
 1. A concise summary (max 2-3 sentences).
 2. Sentiment analysis (Positive / Negative / Neutral) with a brief explanation.
 3. A list of 2-4 key topics discussed.
@@ -34,17 +35,128 @@ Summary: <Your 2–3 sentence summary here>
 Sentiment Analysis: <Positive / Negative / Neutral> — <Brief explanation of the sentiment>
 
 Topics: <Comma-separated list of 2–4 key topics>
+"""
 
+ANALYSIS_TEMPLATE = (
+	"""
+Given the following content, provide:
+"""
+	+ REPORT_FORMAT
+	+ """
 Content:
 {content}
-""",
-		)
-	]
+"""
 )
 
+# Long articles are analysed section by section (map) and the section
+# analyses are then combined into one report (reduce).
+SECTION_TEMPLATE = (
+	"""
+The following is one section of a longer article. For this section, provide:
+"""
+	+ REPORT_FORMAT
+	+ """
+Section:
+{content}
+"""
+)
+
+REDUCE_TEMPLATE = (
+	"""
+The following are analyses of consecutive sections of one article. Combine them into an analysis of the whole article and provide:
+"""
+	+ REPORT_FORMAT
+	+ """
+Section analyses:
+{analyses}
+"""
+)
+
+prompt = ChatPromptTemplate.from_messages([('user', ANALYSIS_TEMPLATE)])
+section_prompt = ChatPromptTemplate.from_messages([('user', SECTION_TEMPLATE)])
+reduce_prompt = ChatPromptTemplate.from_messages([('user', REDUCE_TEMPLATE)])
+
+# Changes whenever the model, a template or the section size changes,
+# which invalidates every cached analysis made with the previous ones.
+PROMPT_VERSION = hashlib.sha256(
+	f'{MODEL_NAME}\n{ANALYSIS_TEMPLATE}\n{REDUCE_TEMPLATE}\n'
+	f'{SECTION_TEMPLATE}\n{config.AI_CHUNK_TOKENS}'.encode('utf-8')
+).hexdigest()[:16]
+SECTION_PROMPT_VERSION = hashlib.sha256(
+	f'{MODEL_NAME}\n{SECTION_TEMPLATE}'.encode('utf-8')
+).hexdigest()[:16]
+
 
 chain = prompt | llm | StrOutputParser()
+section_chain = section_prompt | llm | StrOutputParser()
+reduce_chain = reduce_prompt | llm | StrOutputParser()
+
+# Shared by every LLM call of this process so a burst of AI requests
+# cannot take over the event loop and the outbound connections.
+llm_limiter = ConcurrencyLimiter(
+	max_concurrency=config.AI_MAX_CONCURRENCY,
+	max_queue=config.AI_MAX_QUEUE,
+)
+
+
+def analysis_hash(content: str) -> str:
+	"""
+	Cache key of the analysis of `content` under the current prompt.
+	"""
+	return hashlib.sha256(
+		f'{PROMPT_VERSION}\n{content}'.encode('utf-8')
+	).hexdigest()
+
+
+def section_hash(section: str) -> str:
+	"""
+	Cache key of the analysis of one section of a long article.
+	"""
+	return hashlib.sha256(
+		f'{SECTION_PROMPT_VERSION}\n{section}'.encode('utf-8')
+	).hexdigest()
+
+
+def reduce_input(analyses: list[str]) -> dict:
+	return {
+		'analyses': '\n\n'.join(
+			f'Section {i}:\n{analysis}'
+			for i, analysis in enumerate(analyses, start=1)
+		)
+	}
+
+
+async def asummarize_content(content: str) -> str:
+	"""
+	Analysis report of `content` from the chain, awaited without blocking
+	the event loop. Raises LimiterFullError when too many analyses are
+	already queued.
+	"""
+	async with llm_limiter:
+		return await chain.ainvoke({'content': content})
+
+
+async def astream_content(content: str) -> AsyncIterator[str]:
+	"""
+	Streaming variant of `asummarize_content`, yields the report as the
+	model generates it. The limiter slot is held until the stream ends.
+	"""
+	async with llm_limiter:
+		async for chunk in chain.astream({'content': content}):
+			yield chunk
+
+
+async def aanalyse_section(section: str) -> str:
+	async with llm_limiter:
+		return await section_chain.ainvoke({'content': section})
+
+
+async def areduce_analyses(analyses: list[str]) -> str:
+	async with llm_limiter:
+		return await reduce_chain.ainvoke(reduce_input(analyses))
 
 
-def summarize_content(content: str) -> str:
-	return chain.invoke({'content': content})
+async def astream_reduce(analyses: list[str]) -> AsyncIterator[str]:
+	async with llm_limiter:
+		async for chunk in reduce_chain.astream(reduce_input(analyses)):
+			yield chunk
@@ -0,0 +1,108 @@
+from typing import Optional
+
+from app.repositories.analysis_repo import AnalysisRepository
+from app.services.config import config
+from app.utils.cache import LRUCache
+from app.utils.singleflight import SingleFlight
+
+
+class AnalysisCache:
+	"""
+	In-process LRU in front of the article_analyses table. Keeps hit and
+	miss counters so the saved LLM calls can be monitored.
+
+	Misses are generated through `flight`, so concurrent requests for the
+	same article and content share one LLM call.
+	"""
+
+	def __init__(self, maxsize: int):
+		self.reports = LRUCache(maxsize)
+		self.flight = SingleFlight()
+		self.memory_hits = 0
+		self.db_hits = 0
+		self.misses = 0
+
+	async def get(
+		self, repo: AnalysisRepository, article_id: int, content_hash: str
+	) -> Optional[str]:
+		key = (article_id, content_hash)
+		report = self.reports.get(key)
+		if report is not None:
+			self.memory_hits += 1
+			return report
+
+		report = await repo.get_report(article_id, content_hash)
+		if report is not None:
+			self.db_hits += 1
+			self.reports.set(key, report)
+			return report
+
+		self.misses += 1
+		return None
+
+	async def get_many(
+		self,
+		repo: AnalysisRepository,
+		article_id: int,
+		content_hashes: list[str],
+	) -> list[Optional[str]]:
+		"""
+		Like `get` for several hashes of one article, the ones missing from
+		memory are looked up with a single query.
+		"""
+		reports = [
+			self.reports.get((article_id, content_hash))
+			for content_hash in content_hashes
+		]
+		self.memory_hits += sum(report is not None for report in reports)
+
+		missing = {
+			content_hash
+			for content_hash, report in zip(content_hashes, reports)
+			if report is None
+		}
+		stored = {}
+		if missing:
+			stored = await repo.get_reports(article_id, list(missing))
+		for content_hash, report in stored.items():
+			self.reports.set((article_id, content_hash), report)
+
+		for i, content_hash in enumerate(content_hashes):
+			if reports[i] is not None:
+				continue
+			reports[i] = stored.get(content_hash)
+			if reports[i] is not None:
+				self.db_hits += 1
+			else:
+				self.misses += 1
+		return reports
+
+	async def set(
+		self,
+		repo: AnalysisRepository,
+		article_id: int,
+		content_hash: str,
+		prompt_version: str,
+		report: str,
+	):
+		await repo.save_report(
+			article_id, content_hash, prompt_version, report
+		)
+		self.reports.set((article_id, content_hash), report)
+
+	def stats(self) -> dict:
+		hits = self.memory_hits + self.db_hits
+		lookups = hits + self.misses
+		return {
+			'memory_hits': self.memory_hits,
+			'db_hits': self.db_hits,
+			'misses': self.misses,
+			'hit_ratio': round(hits / lookups, 4) if lookups else 0.0,
+			'coalesced': self.flight.coalesced,
+			'in_flight': self.flight.in_flight,
+			'llm_calls_saved': hits + self.flight.coalesced,
+			'cached_in_memory': len(self.reports),
+		}
+
+
+analysis_cache = AnalysisCache(maxsize=config.AI_CACHE_SIZE)
@@ -1,11 +1,14 @@
-import json
-
 from app.enums.tokens import TokenType
+from app.schemas import StandardResponse
+from app.schemas.tokens import TokenData
+from app.services.config import config
 from app.services.connection import get_db
+from app.services.principal_cache import principal_cache
+from app.services.revocation import revocations
 from app.usecases import users as users_usecases
 from app.utils.logger import Logger
 from app.utils.token import Token
-from fastapi import Depends, status
+from fastapi import Depends, Request, status
 from fastapi.security import HTTPBasicCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -39,7 +42,7 @@ async def validate_token(
 			status.HTTP_200_OK,
 			True,
 			'Token validate!',
-			token_data.model_dump_json(),
+			token_data,
 		)
 	except Exception as e:
 		logger.error(f'Something went wrong with validate token: {e}')
@@ -81,7 +84,16 @@ async def refresh_token(
 			logger.info('Unauthorized!')
 			return status_code, False, message, None
 
-		data_json = json.loads(data['data'])
+		data_json = data['data'].model_dump()
+		if not data_json['is_active']:
+			logger.info('You are not a active user!')
+			return (
+				status.HTTP_403_FORBIDDEN,
+				False,
+				'You are not a active user!',
+				None,
+			)
+
 		access_token = Token.create_token(
 			{
 				'id': token_data.id,
@@ -110,9 +122,66 @@ async def refresh_token(
 		)
 
 
+def claims_principal(token_data: TokenData) -> dict:
+	"""
+	The principal `logged_in` returns, built from the token claims alone.
+	"""
+	return {
+		'id': token_data.id,
+		'username': token_data.username,
+		'email': token_data.email,
+		'full_name': token_data.full_name,
+		'is_active': True,
+		'photo': token_data.photo,
+		'role': {'role': token_data.role},
+	}
+
+
 async def logged_in(
+	request: Request,
 	credentials: HTTPBasicCredentials = Depends(security),
 	db: AsyncSession = Depends(get_db),
+):
+	return await authenticate(request, credentials, db, config.AUTH_STATELESS)
+
+
+async def logged_in_strict(
+	request: Request,
+	credentials: HTTPBasicCredentials = Depends(security),
+	db: AsyncSession = Depends(get_db),
+):
+	"""
+	Like `logged_in` but always checks the user against the database.
+	"""
+	return await authenticate(request, credentials, db, stateless=False)
+
+
+async def authenticate(
+	request: Request,
+	credentials: HTTPBasicCredentials,
+	db: AsyncSession,
+	stateless: bool = False,
+):
+	"""
+	Resolves the user of an access token once per request, the result is
+	kept in `request.state`. With `stateless` the signed claims are trusted
+	unless the user's tokens were revoked, otherwise the user is loaded
+	from the database (through the principal cache).
+	"""
+	principals = getattr(request.state, 'principals', None)
+	if principals is None:
+		principals = request.state.principals = {}
+	if stateless not in principals:
+		principals[stateless] = await resolve_principal(
+			credentials, db, stateless
+		)
+	return principals[stateless]
+
+
+async def resolve_principal(
+	credentials: HTTPBasicCredentials,
+	db: AsyncSession,
+	stateless: bool,
 ):
 	try:
 		token = credentials.credentials
@@ -133,13 +202,41 @@ async def logged_in(
 				None,
 			)
 
-		status_code, success, message, data = await users_usecases.auth(
-			token_data.id, db
-		)
+		# Tokens issued before `iat` was added always take the DB path
+		if stateless and token_data.iat and revocations.healthy:
+			if revocations.is_revoked(token_data.id, token_data.iat):
+				logger.info('Token revoked!')
+				return (
+					status.HTTP_401_UNAUTHORIZED,
+					False,
+					'Token revoked!',
+					None,
+				)
+			return (
+				status.HTTP_200_OK,
+				True,
+				'Authenticated!',
+				{'data': claims_principal(token_data)},
+			)
+
+		principal = principal_cache.get(token_data.id)
+		if principal is None:
+			status_code, success, message, data = await users_usecases.auth(
+				token_data.id, db
+			)
+			if not success:
+				logger.info('Unauthorized!')
+				return (
+					status.HTTP_401_UNAUTHORIZED,
+					False,
+					'Unauthorized!',
+					None,
+				)
 
-		data_json = json.loads(data['data'])
+			principal = data['data'].model_dump()
+			principal_cache.set(token_data.id, principal)
 
-		if not data_json['is_active']:
+		if not principal['is_active']:
 			logger.info('You are not a active user!')
 			return (
 				status.HTTP_403_FORBIDDEN,
@@ -148,15 +245,12 @@ async def logged_in(
 				None,
 			)
 
-		if not success:
-			logger.info('Unauthorized!')
-			return status.HTTP_401_UNAUTHORIZED, False, 'Unauthorized!', None
-
+		# The principal is shared with later requests, do not modify it
 		return (
-			status_code,
-			success,
-			message,
-			{'data': json.loads(data['data'])},
+			status.HTTP_200_OK,
+			True,
+			'Authenticated!',
+			{'data': principal},
 		)
 
 	except Exception as e:
@@ -171,15 +265,21 @@ async def logged_in(
 
 def rbac_required(
 	required_roles,
+	sensitive: bool = False,
 ):
+	"""
+	Role check on top of `logged_in`, so the principal and the session are
+	shared with the route. `sensitive` routes always check the user against
+	the database, even in stateless auth mode.
+	"""
+
 	async def role_checker(
-		credentials: HTTPBasicCredentials = Depends(security),
-		db: AsyncSession = Depends(get_db),
+		user: StandardResponse = Depends(
+			logged_in_strict if sensitive else logged_in
+		),
 	):
 		try:
-			status_code, success, message, data = await logged_in(
-				credentials, db
-			)
+			status_code, success, message, data = user
 			if not success:
 				return status_code, success, message, data
 
@@ -12,6 +12,39 @@ class Config(BaseSettings):
 	DB_NAME: str
 	SECRET_KEY: str
 	ALGORITHM: str
+	COUNT_ESTIMATE_THRESHOLD: int = 10000
+	DB_INSERT_BATCH_SIZE: int = 1000
+	DB_POOL_SIZE: int = 5
+	DB_MAX_OVERFLOW: int = 10
+	DB_POOL_TIMEOUT: float = 30
+	DB_POOL_RECYCLE: int = 1800
+	# Pings on every checkout, DB_POOL_RECYCLE already retires old
+	# connections; turn on behind proxies that drop idle ones
+	DB_POOL_PRE_PING: bool = False
+	# 0 disables prepared statement caching, needed behind pgbouncer in
+	# transaction mode
+	DB_STATEMENT_CACHE_SIZE: int = 100
+	# Milliseconds, 0 means no limit
+	DB_STATEMENT_TIMEOUT: int = 0
+	# Comma separated postgresql+asyncpg:// DSNs of read replicas
+	DB_REPLICA_DSNS: str = ''
+	DB_REPLICA_CHECK_INTERVAL: float = 5
+	DB_REPLICA_MAX_LAG: float = 10
+	READ_YOUR_WRITES_WINDOW: float = 5
+	PASSWORD_HASH_WORKERS: int = 4
+	AUTH_CACHE_TTL: float = 30
+	AUTH_CACHE_SIZE: int = 10000
+	AUTH_STATELESS: bool = False
+	AI_MAX_CONCURRENCY: int = 4
+	AI_MAX_QUEUE: int = 32
+	AI_CACHE_SIZE: int = 512
+	AI_TIMEOUT: float = 60
+	AI_CHUNK_TOKENS: int = 3000
+	AI_CHUNK_FANOUT: int = 3
+	AI_JOB_BACKEND: str = 'postgres'
+	AI_JOB_WORKERS: int = 2
+	AI_JOB_STALE_AFTER: float = 300
+	AI_JOB_POLL_INTERVAL: float = 1
 
 	@property
 	def dev(self):
@@ -29,6 +62,40 @@ class Config(BaseSettings):
 	def db_dsn(self) -> str:
 		return f'postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}'
 
+	@property
+	def db_replica_dsns(self) -> list[str]:
+		return [
+			dsn.strip()
+			for dsn in self.DB_REPLICA_DSNS.split(',')
+			if dsn.strip()
+		]
+
+	@property
+	def db_engine_options(self) -> dict:
+		server_settings = {}
+		if self.DB_STATEMENT_TIMEOUT:
+			server_settings['statement_timeout'] = str(
+				self.DB_STATEMENT_TIMEOUT
+			)
+		return {
+			'pool_size': self.DB_POOL_SIZE,
+			'max_overflow': self.DB_MAX_OVERFLOW,
+			'pool_timeout': self.DB_POOL_TIMEOUT,
+			'pool_recycle': self.DB_POOL_RECYCLE,
+			'pool_pre_ping': self.DB_POOL_PRE_PING,
+			'connect_args': {
+				# asyncpg's own cache and SQLAlchemy's adapter cache
+				'statement_cache_size': self.DB_STATEMENT_CACHE_SIZE,
+				'prepared_statement_cache_size': self.DB_STATEMENT_CACHE_SIZE,
+				'server_settings': server_settings,
+			},
+		}
+
+	@property
+	def pg_dsn(self) -> str:
+		# Plain libpq DSN for connections made with asyncpg directly
+		return f'postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}'
+
 	class Config:
 		env_file = '.env'
 		env_file_encoding = 'utf-8'
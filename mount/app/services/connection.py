@@ -1,6 +1,12 @@
+import asyncio
 import contextlib
-from typing import AsyncIterator, Union
+import itertools
+import logging
+import os
+from typing import AsyncIterator, Optional, Sequence, Union
 
+from fastapi import Request
+from sqlalchemy import exc, text
 from sqlalchemy.ext.asyncio import (
 	AsyncConnection,
 	AsyncEngine,
@@ -9,28 +15,206 @@ from sqlalchemy.ext.asyncio import (
 	create_async_engine,
 )
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.services.config import config
+from app.services.read_your_writes import pinned_to_primary
+from app.utils.logger import Logger
 
 Base = declarative_base()
 
+logger = Logger(__name__)
+
+# Seconds a replica is behind the primary, 0 when it has replayed all the
+# WAL it received (an idle primary sends none) or when it is no replica
+REPLICA_LAG_QUERY = text(
+	'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() '
+	'THEN 0 ELSE coalesce(extract(epoch FROM '
+	'now() - pg_last_xact_replay_timestamp()), 0) END'
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+	"""
+	Queue pool that counts the checkouts waiting for a free connection and
+	the ones that gave up after the pool timeout.
+	"""
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.waiters = 0
+		self.timeouts = 0
+
+	def _do_get(self):
+		exhausted = (
+			self._max_overflow > -1
+			and self._overflow >= self._max_overflow
+			and self.checkedin() == 0
+		)
+		if not exhausted:
+			return super()._do_get()
+
+		self.waiters += 1
+		try:
+			return super()._do_get()
+		except exc.TimeoutError:
+			self.timeouts += 1
+			raise
+		finally:
+			self.waiters -= 1
+
+
+# SQLAlchemy names the pool's logger after its class, which puts it under
+# this module's debug logger; keep the per-checkout messages out
+logging.getLogger(f'{__name__}.{InstrumentedPool.__name__}').setLevel(
+	logging.WARNING
+)
+
 
 class DatabaseSessionManager:
 	def __init__(self):
 		self._engine: Union[AsyncEngine, None] = None
 		self._sessionmaker: Union[async_sessionmaker, None] = None
+		self._replica_engines: list[AsyncEngine] = []
+		self._replica_sessionmakers: list[async_sessionmaker] = []
+		self._replica_healthy: list[bool] = []
+		self._replica_turn = itertools.count()
+		self._replica_checks: Optional[asyncio.Task] = None
 
-	def init(self, host: str):
-		self._engine = create_async_engine(host)
+	def init(self, host: str, replicas: Sequence[str] = (), **engine_options):
+		"""
+		Creates the engine for `host` and one per read replica DSN,
+		`engine_options` are passed on to create_async_engine (pool
+		sizing, connect_args, ...) for all of them.
+		"""
+		engine_options.setdefault('poolclass', InstrumentedPool)
+		self._engine = create_async_engine(host, **engine_options)
 		self._sessionmaker = async_sessionmaker(
 			autocommit=False, bind=self._engine, expire_on_commit=False
 		)
+		self._replica_engines = [
+			create_async_engine(replica, **engine_options)
+			for replica in replicas
+		]
+		self._replica_sessionmakers = [
+			async_sessionmaker(
+				autocommit=False, bind=engine, expire_on_commit=False
+			)
+			for engine in self._replica_engines
+		]
+		self._replica_healthy = [True] * len(self._replica_engines)
+
+	@property
+	def has_replicas(self) -> bool:
+		return bool(self._replica_engines)
 
 	async def close(self):
 		if self._engine is None:
 			raise Exception('DatabaseSessionManager is not initialized')
+		await self.stop_replica_checks()
+		for engine in self._replica_engines:
+			await engine.dispose()
+		self._replica_engines = []
+		self._replica_sessionmakers = []
+		self._replica_healthy = []
 		await self._engine.dispose()
 		self._engine = None
 		self._sessionmaker = None
 
+	async def check_replicas(self):
+		"""
+		Marks each replica healthy when it answers within the pool timeout
+		and lags at most DB_REPLICA_MAX_LAG seconds behind the primary.
+		"""
+		for index, engine in enumerate(self._replica_engines):
+			try:
+				lag = await asyncio.wait_for(
+					self._replica_lag(engine), config.DB_POOL_TIMEOUT
+				)
+				healthy = lag <= config.DB_REPLICA_MAX_LAG
+				reason = f'lag {lag:.1f}s'
+			except Exception as e:
+				healthy = False
+				reason = str(e) or type(e).__name__
+
+			if healthy != self._replica_healthy[index]:
+				state = 'back' if healthy else 'down'
+				logger.warning(f'Read replica {index} is {state}: {reason}')
+			self._replica_healthy[index] = healthy
+
+	@staticmethod
+	async def _replica_lag(engine: AsyncEngine) -> float:
+		async with engine.connect() as connection:
+			result = await connection.execute(REPLICA_LAG_QUERY)
+			return float(result.scalar_one())
+
+	async def _replica_check_loop(self, interval: float):
+		while True:
+			await self.check_replicas()
+			await asyncio.sleep(interval)
+
+	def start_replica_checks(self, interval: float):
+		if self.has_replicas and self._replica_checks is None:
+			self._replica_checks = asyncio.create_task(
+				self._replica_check_loop(interval)
+			)
+
+	async def stop_replica_checks(self):
+		if self._replica_checks is None:
+			return
+		self._replica_checks.cancel()
+		with contextlib.suppress(asyncio.CancelledError):
+			await self._replica_checks
+		self._replica_checks = None
+
+	def _next_replica(self) -> Optional[int]:
+		"""
+		Index of the next healthy replica in round-robin order, None when
+		none is healthy.
+		"""
+		count = len(self._replica_engines)
+		start = next(self._replica_turn)
+		for offset in range(count):
+			index = (start + offset) % count
+			if self._replica_healthy[index]:
+				return index
+		return None
+
+	def pool_stats(self) -> dict:
+		"""
+		Live state of this worker's connection pools, InstrumentedPools.
+		Overflow is the number of open connections minus the pool size,
+		negative until the pool has filled up.
+		"""
+		if self._engine is None:
+			raise Exception('DatabaseSessionManager is not initialized')
+
+		stats = {'pid': os.getpid(), **self._engine_pool_stats(self._engine)}
+		stats['replicas'] = [
+			{
+				'healthy': healthy,
+				**self._engine_pool_stats(engine),
+			}
+			for engine, healthy in zip(
+				self._replica_engines, self._replica_healthy
+			)
+		]
+		return stats
+
+	@staticmethod
+	def _engine_pool_stats(engine: AsyncEngine) -> dict:
+		pool = engine.pool
+		return {
+			'size': pool.size(),
+			'checked_out': pool.checkedout(),
+			'checked_in': pool.checkedin(),
+			'overflow': pool.overflow(),
+			'max_overflow': pool._max_overflow,
+			'timeout': pool.timeout(),
+			'waiters': pool.waiters,
+			'timeouts': pool.timeouts,
+		}
+
 	@contextlib.asynccontextmanager
 	async def connect(self) -> AsyncIterator[AsyncConnection]:
 		if self._engine is None:
@@ -43,6 +227,60 @@ class DatabaseSessionManager:
 				await connection.rollback()
 				raise
 
+	@contextlib.asynccontextmanager
+	async def read_session(
+		self, primary: Optional[AsyncSession] = None
+	) -> AsyncIterator[AsyncSession]:
+		"""
+		Session on the next healthy replica, or on the primary when there
+		is none: `primary` when given, a new session otherwise. The
+		replica connection is taken up front; a replica that refuses it
+		is skipped until the next health check passes and the next one
+		(or the primary) is tried instead.
+		"""
+		if self._sessionmaker is None:
+			raise Exception('DatabaseSessionManager is not initialized')
+
+		session = await self._replica_session()
+		if session is None and primary is not None:
+			yield primary
+			return
+		if session is None:
+			async with self.session() as session:
+				yield session
+			return
+
+		try:
+			yield session
+		except Exception:
+			await session.rollback()
+			raise
+		finally:
+			await session.close()
+
+	async def _replica_session(self) -> Optional[AsyncSession]:
+		"""
+		Session holding a connection to a healthy replica, None when no
+		replica can give one.
+		"""
+		for _ in range(len(self._replica_engines)):
+			index = self._next_replica()
+			if index is None:
+				return None
+
+			session = self._replica_sessionmakers[index]()
+			try:
+				await session.connection()
+			except Exception as e:
+				# asyncpg raises connect errors unwrapped: refused, not
+				# accepting connections, timeouts, ...
+				self._replica_healthy[index] = False
+				logger.warning(f'Read replica {index} is down: {e}')
+				await session.close()
+				continue
+			return session
+		return None
+
 	@contextlib.asynccontextmanager
 	async def session(self) -> AsyncIterator[AsyncSession]:
 		if self._sessionmaker is None:
@@ -61,7 +299,49 @@ class DatabaseSessionManager:
 sessionmanager = DatabaseSessionManager()
 
 
-# Dependency to use in FastAPI endpoints
-async def get_db():
+@contextlib.asynccontextmanager
+async def request_session(request: Request) -> AsyncIterator[AsyncSession]:
+	"""
+	The primary session of `request`, created on first use and shared by
+	every dependency of the request. Like any AsyncSession it only takes
+	a pooled connection when it runs its first statement.
+	"""
+	session = getattr(request.state, 'db_session', None)
+	if session is not None:
+		yield session
+		return
+
 	async with sessionmanager.session() as session:
+		request.state.db_session = session
+		try:
+			yield session
+		finally:
+			request.state.db_session = None
+
+
+async def release(session: AsyncSession):
+	"""
+	Ends the session's transaction so its connection goes back to the
+	pool, e.g. before slow work that needs no database. Loaded objects
+	stay usable (expire_on_commit is off) and the next statement takes a
+	connection again.
+	"""
+	if session.in_transaction():
+		await session.commit()
+
+
+# Dependency to use in FastAPI endpoints
+async def get_db(request: Request):
+	async with request_session(request) as session:
 		yield session
+
+
+# Dependency for read-only endpoints, served by a replica when there is
+# a healthy one and the client did not write recently
+async def get_read_db(request: Request):
+	async with request_session(request) as primary:
+		if pinned_to_primary(request):
+			yield primary
+		else:
+			async with sessionmanager.read_session(primary) as session:
+				yield session
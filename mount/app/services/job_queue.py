@@ -0,0 +1,88 @@
+import asyncio
+from typing import Awaitable, Callable, List
+
+from app.enums.jobs import JobStatus
+from app.schemas.agent import AnalysisJobResponse
+from app.services.config import config
+from app.services.job_store import JobStore, get_job_store
+from app.utils.concurrency import LimiterFullError
+from app.utils.logger import Logger
+
+logger = Logger(__name__)
+
+JobHandler = Callable[[AnalysisJobResponse], Awaitable[str]]
+
+
+class AnalysisJobQueue:
+	"""
+	In-process worker pool for analysis jobs. Job state lives in `store`,
+	the asyncio queue only carries job ids to the workers of this process.
+	"""
+
+	def __init__(self, store: JobStore, workers: int):
+		self.store = store
+		self.workers = workers
+		self.queue: asyncio.Queue[str] = asyncio.Queue()
+		self._handler: JobHandler = None
+		self._tasks: List[asyncio.Task] = []
+
+	async def start(self, handler: JobHandler):
+		"""
+		Starts the workers and re-enqueues the jobs left over by a previous
+		run of the application.
+		"""
+		self._handler = handler
+		for job_id in await self.store.recover(config.AI_JOB_STALE_AFTER):
+			self.queue.put_nowait(job_id)
+		self._tasks = [
+			asyncio.create_task(self._worker()) for _ in range(self.workers)
+		]
+
+	async def stop(self):
+		for task in self._tasks:
+			task.cancel()
+		await asyncio.gather(*self._tasks, return_exceptions=True)
+		self._tasks = []
+
+	async def submit(
+		self, article_id: int, user_id: int
+	) -> AnalysisJobResponse:
+		job = await self.store.create(article_id, user_id)
+		self.queue.put_nowait(job.id)
+		return job
+
+	async def _worker(self):
+		while True:
+			job_id = await self.queue.get()
+			try:
+				await self._run(job_id)
+			finally:
+				self.queue.task_done()
+
+	async def _run(self, job_id: str):
+		try:
+			if not await self.store.claim(job_id):
+				return
+
+			job = await self.store.get(job_id)
+			report = await self._handler(job)
+			await self.store.finish(
+				job_id, JobStatus.SUCCEEDED.value, analysis_report=report
+			)
+		except asyncio.CancelledError:
+			# Shutting down, leave the job for the next start
+			await self.store.finish(job_id, JobStatus.QUEUED.value)
+			raise
+		except LimiterFullError as e:
+			logger.info(f'AI agent is busy, retrying job {job_id}: {e}')
+			await self.store.finish(job_id, JobStatus.QUEUED.value)
+			await asyncio.sleep(config.AI_JOB_POLL_INTERVAL)
+			self.queue.put_nowait(job_id)
+		except Exception as e:
+			logger.error(f'Analysis job {job_id} failed: {e}')
+			await self.store.finish(
+				job_id, JobStatus.FAILED.value, error=str(e)
+			)
+
+
+analysis_jobs = AnalysisJobQueue(get_job_store(), config.AI_JOB_WORKERS)
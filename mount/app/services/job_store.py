@@ -0,0 +1,161 @@
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from app.enums.jobs import JobBackend, JobStatus
+from app.repositories.job_repo import JobRepository
+from app.schemas.agent import AnalysisJobResponse
+from app.services.config import config
+from app.services.connection import sessionmanager
+
+
+class JobStore(ABC):
+	"""
+	Where analysis jobs live. Workers and readers only go through these
+	methods, so the backend can be swapped by AI_JOB_BACKEND.
+	"""
+
+	@abstractmethod
+	async def create(
+		self, article_id: int, user_id: int
+	) -> AnalysisJobResponse: ...
+
+	@abstractmethod
+	async def get(self, job_id: str) -> Optional[AnalysisJobResponse]: ...
+
+	@abstractmethod
+	async def claim(self, job_id: str) -> bool: ...
+
+	@abstractmethod
+	async def finish(
+		self,
+		job_id: str,
+		status: str,
+		analysis_report: Optional[str] = None,
+		error: Optional[str] = None,
+	): ...
+
+	@abstractmethod
+	async def recover(self, stale_after: float) -> List[str]: ...
+
+
+class PostgresJobStore(JobStore):
+	"""
+	Keeps jobs in the analysis_jobs table so they survive restarts. Every
+	call uses a short session of its own, workers never hold a connection
+	while the LLM is running.
+	"""
+
+	async def create(
+		self, article_id: int, user_id: int
+	) -> AnalysisJobResponse:
+		async with sessionmanager.session() as session:
+			job = await JobRepository(session).create(
+				{
+					'id': str(uuid.uuid4()),
+					'article_id': article_id,
+					'user_id': user_id,
+					'status': JobStatus.QUEUED.value,
+				}
+			)
+			return AnalysisJobResponse.model_validate(
+				job, from_attributes=True
+			)
+
+	async def get(self, job_id: str) -> Optional[AnalysisJobResponse]:
+		async with sessionmanager.session() as session:
+			job = await JobRepository(session).get_by_field('id', job_id)
+			if job is None:
+				return None
+			return AnalysisJobResponse.model_validate(
+				job, from_attributes=True
+			)
+
+	async def claim(self, job_id: str) -> bool:
+		async with sessionmanager.session() as session:
+			return await JobRepository(session).claim(job_id)
+
+	async def finish(
+		self,
+		job_id: str,
+		status: str,
+		analysis_report: Optional[str] = None,
+		error: Optional[str] = None,
+	):
+		async with sessionmanager.session() as session:
+			await JobRepository(session).finish(
+				job_id, status, analysis_report, error
+			)
+
+	async def recover(self, stale_after: float) -> List[str]:
+		stale_before = datetime.now(timezone.utc) - timedelta(
+			seconds=stale_after
+		)
+		async with sessionmanager.session() as session:
+			return await JobRepository(session).recover(stale_before)
+
+
+class InMemoryJobStore(JobStore):
+	"""
+	Process local store for tests and single process setups. Jobs are lost
+	on restart.
+	"""
+
+	def __init__(self):
+		self.jobs: dict[str, AnalysisJobResponse] = {}
+
+	async def create(
+		self, article_id: int, user_id: int
+	) -> AnalysisJobResponse:
+		now = datetime.now(timezone.utc)
+		job = AnalysisJobResponse(
+			id=str(uuid.uuid4()),
+			article_id=article_id,
+			user_id=user_id,
+			status=JobStatus.QUEUED.value,
+			created_at=now,
+			updated_at=now,
+		)
+		self.jobs[job.id] = job
+		return job.model_copy()
+
+	async def get(self, job_id: str) -> Optional[AnalysisJobResponse]:
+		job = self.jobs.get(job_id)
+		return job.model_copy() if job else None
+
+	async def claim(self, job_id: str) -> bool:
+		job = self.jobs.get(job_id)
+		if job is None or job.status != JobStatus.QUEUED.value:
+			return False
+		job.status = JobStatus.RUNNING.value
+		job.updated_at = datetime.now(timezone.utc)
+		return True
+
+	async def finish(
+		self,
+		job_id: str,
+		status: str,
+		analysis_report: Optional[str] = None,
+		error: Optional[str] = None,
+	):
+		job = self.jobs.get(job_id)
+		if job is None:
+			return
+		job.status = status
+		job.analysis_report = analysis_report
+		job.error = error
+		job.updated_at = datetime.now(timezone.utc)
+
+	async def recover(self, stale_after: float) -> List[str]:
+		return [
+			job.id
+			for job in self.jobs.values()
+			if job.status == JobStatus.QUEUED.value
+		]
+
+
+def get_job_store() -> JobStore:
+	if config.AI_JOB_BACKEND == JobBackend.MEMORY.value:
+		return InMemoryJobStore()
+	return PostgresJobStore()
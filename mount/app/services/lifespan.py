@@ -3,6 +3,9 @@ from contextlib import asynccontextmanager
 
 from app.services.config import config
 from app.services.connection import sessionmanager
+from app.services.job_queue import analysis_jobs
+from app.services.revocation import revocations
+from app.usecases.agent_usecase import run_analysis_job
 from fastapi import FastAPI
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.sql import text
@@ -17,8 +20,12 @@ async def lifespan(app: FastAPI):
 	- Initializes the database connection using the provided configuration.
 	- Verifies that the database connection is healthy by executing a simple query.
 	- If connection lost then retry and log.
+	- With read replicas configured, starts their health checks.
+	- Starts the AI analysis job workers and resumes unfinished jobs.
+	- In stateless auth mode, starts listening for token revocations.
 
 	Shutdown:
+	- Stops the job workers, running jobs are queued again.
 	- Closes the database connection to ensure proper resource cleanup.
 
 	This function is invoked automatically by FastAPI when the application starts
@@ -30,7 +37,11 @@ async def lifespan(app: FastAPI):
 	retry_delay = 5  # seconds
 
 	# Startup logic: Initialize and verify the database connection with retries
-	sessionmanager.init(config.db_dsn)
+	sessionmanager.init(
+		config.db_dsn,
+		replicas=config.db_replica_dsns,
+		**config.db_engine_options,
+	)
 	for attempt in range(max_retries):
 		try:
 			async with sessionmanager.session() as session:
@@ -53,10 +64,30 @@ async def lifespan(app: FastAPI):
 					'Database connection failed during startup. Exiting.'
 				) from e
 
+	if sessionmanager.has_replicas:
+		sessionmanager.start_replica_checks(config.DB_REPLICA_CHECK_INTERVAL)
+		print(f'[+] Routing reads to {len(config.db_replica_dsns)} replicas.')
+
+	if config.AUTH_STATELESS:
+		await revocations.start()
+		print('[+] Listening for token revocations.')
+
+	await analysis_jobs.start(run_analysis_job)
+	print(f'[+] Started {analysis_jobs.workers} AI analysis job workers.')
+
 	# separate startup and shutdown
 	yield
 
 	# Shutdown logic
+	if config.AUTH_STATELESS:
+		await revocations.stop()
+
+	try:
+		await analysis_jobs.stop()
+		print('[/] AI analysis job workers stopped.')
+	except Exception as e:
+		print(f'[-] Error stopping AI analysis job workers: {e}')
+
 	try:
 		await sessionmanager.close()
 		print('[/] Database connection closed during shutdown.')
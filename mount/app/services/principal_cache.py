@@ -0,0 +1,9 @@
+from app.services.config import config
+from app.utils.cache import TTLCache
+
+# Authenticated user (with role) by user id, as returned by `logged_in`.
+# Entries must be dropped whenever the user or its status changes. Other
+# processes keep their copy until it expires, at most AUTH_CACHE_TTL.
+principal_cache = TTLCache(
+	maxsize=config.AUTH_CACHE_SIZE, ttl=config.AUTH_CACHE_TTL
+)
@@ -0,0 +1,43 @@
+import time
+
+from fastapi import Request
+
+from app.services.config import config
+
+# Epoch seconds until which the client's reads go to the primary
+PRIMARY_COOKIE = 'db_primary_until'
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+def pinned_to_primary(request: Request) -> bool:
+	"""
+	Whether the client wrote within the last READ_YOUR_WRITES_WINDOW
+	seconds, so a lagging replica could still miss its change.
+	"""
+	try:
+		until = float(request.cookies.get(PRIMARY_COOKIE, 0))
+	except ValueError:
+		return False
+	return until > time.time()
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+	"""
+	Pins the client to the primary for a short window after a successful
+	write by setting a cookie that get_read_db honours.
+	"""
+	response = await call_next(request)
+	if (
+		config.db_replica_dsns
+		and request.method not in SAFE_METHODS
+		and response.status_code < 400
+	):
+		window = config.READ_YOUR_WRITES_WINDOW
+		response.set_cookie(
+			PRIMARY_COOKIE,
+			f'{time.time() + window:.3f}',
+			max_age=max(1, round(window)),
+			httponly=True,
+			samesite='lax',
+		)
+	return response
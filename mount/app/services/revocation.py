@@ -0,0 +1,135 @@
+import asyncio
+import json
+import time
+from typing import Optional
+
+import asyncpg
+
+from app.repositories.user_repo import UserRepository
+from app.services.config import config
+from app.services.connection import sessionmanager
+from app.utils.logger import Logger
+
+logger = Logger(__name__)
+
+REVOCATION_CHANNEL = 'auth_revocations'
+
+
+class RevocationList:
+	"""
+	Users whose access tokens issued before a given time are rejected by
+	the stateless auth path. Revocations are published with Postgres
+	NOTIFY and every process keeps its set in sync on a LISTEN connection
+	of its own.
+
+	While that connection is down the set may be stale, `healthy` is then
+	False and callers must fall back to the database.
+	"""
+
+	def __init__(self):
+		self._revoked: dict[int, float] = {}
+		self._conn: Optional[asyncpg.Connection] = None
+		self._reconnect_task: Optional[asyncio.Task] = None
+		self._closing = False
+
+	@property
+	def healthy(self) -> bool:
+		return self._conn is not None and not self._conn.is_closed()
+
+	def revoke(self, user_id: int, revoked_at: float):
+		self._revoked[user_id] = max(self._revoked.get(user_id, 0), revoked_at)
+
+	def restore(self, user_id: int):
+		self._revoked.pop(user_id, None)
+
+	def is_revoked(self, user_id: int, issued_at: int) -> bool:
+		revoked_at = self._revoked.get(user_id)
+		return revoked_at is not None and issued_at <= revoked_at
+
+	async def publish(
+		self, user_repo: UserRepository, user_id: int, revoked: bool = True
+	):
+		"""
+		Revokes the current tokens of `user_id` here and, once the caller
+		commits, in every other process. With `revoked` off the user's
+		revocation is lifted instead, e.g. on reactivation: iat has whole
+		seconds only, so a token issued right after the revocation would
+		otherwise still count as revoked.
+		"""
+		revoked_at = time.time() if revoked else None
+		if revoked:
+			self.revoke(user_id, revoked_at)
+		else:
+			self.restore(user_id)
+		await user_repo.notify(
+			REVOCATION_CHANNEL, {'user_id': user_id, 'revoked_at': revoked_at}
+		)
+
+	async def start(self):
+		self._closing = False
+		try:
+			await self._connect()
+		except Exception as e:
+			logger.error(f'Revocation listener failed to connect: {e}')
+			self._schedule_reconnect()
+
+	async def stop(self):
+		self._closing = True
+		if self._reconnect_task:
+			self._reconnect_task.cancel()
+			self._reconnect_task = None
+		if self._conn is not None:
+			await self._conn.close()
+			self._conn = None
+
+	async def _connect(self):
+		conn = await asyncpg.connect(config.pg_dsn)
+		await conn.add_listener(REVOCATION_CHANNEL, self._on_notify)
+		conn.add_termination_listener(self._on_terminate)
+
+		# Listen first so nothing published while seeding is missed
+		try:
+			now = time.time()
+			async with sessionmanager.session() as session:
+				user_repo = UserRepository(session)
+				for user_id in await user_repo.get_inactive_ids():
+					self.revoke(user_id, now)
+		except Exception:
+			await conn.close()
+			raise
+		self._conn = conn
+
+	def _on_notify(self, conn, pid, channel, payload):
+		try:
+			data = json.loads(payload)
+			if data['revoked_at'] is None:
+				self.restore(int(data['user_id']))
+			else:
+				self.revoke(int(data['user_id']), float(data['revoked_at']))
+		except (ValueError, KeyError, TypeError) as e:
+			logger.error(f'Invalid revocation payload {payload!r}: {e}')
+
+	def _on_terminate(self, conn):
+		self._conn = None
+		if not self._closing:
+			logger.error('Revocation listener connection lost')
+			self._schedule_reconnect()
+
+	def _schedule_reconnect(self):
+		if self._reconnect_task is None or self._reconnect_task.done():
+			self._reconnect_task = asyncio.create_task(self._reconnect())
+
+	async def _reconnect(self):
+		delay = 1
+		while not self._closing:
+			await asyncio.sleep(delay)
+			try:
+				await self._connect()
+				logger.info('Revocation listener reconnected')
+				return
+			except Exception as e:
+				logger.error(f'Revocation listener reconnect failed: {e}')
+				delay = min(delay * 2, 30)
+
+
+revocations = RevocationList()
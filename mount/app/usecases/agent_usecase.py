@@ -1,34 +1,171 @@
-import json
+import asyncio
 
-from fastapi import status
+from fastapi import Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.agent import AIAnalysis
-from app.services.agent import summarize_content
+from app.enums.jobs import JobStatus
+from app.enums.roles import RoleEnum
+from app.repositories.analysis_repo import AnalysisRepository
+from app.repositories.article_repo import ArticleRepository
+from app.schemas.agent import AIAnalysis, AnalysisJobResponse
+from app.services.agent import (
+	PROMPT_VERSION,
+	SECTION_PROMPT_VERSION,
+	aanalyse_section,
+	analysis_hash,
+	areduce_analyses,
+	astream_content,
+	astream_reduce,
+	asummarize_content,
+	llm_limiter,
+	section_hash,
+)
+from app.services.analysis_cache import analysis_cache
+from app.services.config import config
+from app.services.connection import release, sessionmanager
+from app.services.job_queue import analysis_jobs
+from app.utils.concurrency import LimiterFullError
+from app.utils.helpers import split_text
 from app.utils.logger import Logger
+from app.utils.sse import SSE_PING, sse_event
 
 from .articles import get_articles
 
 logger = Logger(__name__)
 
 
+async def cached_analysis(db: AsyncSession, article_id: int, content: str):
+	"""
+	Analysis report of `content`, only asking the LLM when neither the
+	memory cache nor the article_analyses table has one for this content
+	and prompt version.
+	"""
+	analysis_repo = AnalysisRepository(db)
+	content_hash = analysis_hash(content)
+
+	report = await analysis_cache.get(analysis_repo, article_id, content_hash)
+	if report is not None:
+		return report
+
+	# The request's connection is not held while the LLM runs
+	await release(db)
+	return await coalesced_analysis(
+		article_id, content, content_hash, config.AI_TIMEOUT
+	)
+
+
+async def coalesced_analysis(
+	article_id: int, content: str, content_hash: str, timeout: float = None
+):
+	return await analysis_cache.flight.do(
+		(article_id, content_hash),
+		lambda: generate_analysis(article_id, content, content_hash),
+		timeout=timeout,
+	)
+
+
+async def generate_analysis(article_id: int, content: str, content_hash: str):
+	"""
+	Runs the LLM and stores the report. It is shared by every caller
+	waiting on the same content and can outlive the request that started
+	it, so it stores the result through its own session.
+	"""
+	report = analysis_cache.reports.get((article_id, content_hash))
+	if report is not None:
+		return report
+
+	report = await analyse_content(article_id, content)
+	await store_analysis(article_id, content_hash, report)
+	return report
+
+
+async def analyse_content(article_id: int, content: str) -> str:
+	"""
+	Single prompt for content that fits in AI_CHUNK_TOKENS, map-reduce
+	over its sections otherwise.
+	"""
+	sections = split_text(content, config.AI_CHUNK_TOKENS)
+	if len(sections) == 1:
+		return await asummarize_content(content)
+	return await areduce_analyses(await analyse_sections(article_id, sections))
+
+
+async def analyse_sections(article_id: int, sections: list[str]) -> list[str]:
+	"""
+	Analysis of every section, at most AI_CHUNK_FANOUT at a time. Section
+	analyses are cached on their own, so after an edit only the sections
+	that changed go to the LLM.
+	"""
+	hashes = [section_hash(section) for section in sections]
+	async with sessionmanager.session() as session:
+		analysis_repo = AnalysisRepository(session)
+		analyses = await analysis_cache.get_many(
+			analysis_repo, article_id, hashes
+		)
+
+	fanout = asyncio.Semaphore(config.AI_CHUNK_FANOUT)
+
+	async def analyse(section: str) -> str:
+		async with fanout:
+			return await aanalyse_section(section)
+
+	missing = [i for i, analysis in enumerate(analyses) if analysis is None]
+	results = await asyncio.gather(
+		*(analyse(sections[i]) for i in missing), return_exceptions=True
+	)
+
+	# Keep the sections that succeeded even if another one failed
+	async with sessionmanager.session() as session:
+		analysis_repo = AnalysisRepository(session)
+		for i, result in zip(missing, results):
+			if isinstance(result, BaseException):
+				continue
+			analyses[i] = result
+			await analysis_cache.set(
+				analysis_repo,
+				article_id,
+				hashes[i],
+				SECTION_PROMPT_VERSION,
+				result,
+			)
+
+	for result in results:
+		if isinstance(result, BaseException):
+			raise result
+	return analyses
+
+
+async def store_analysis(article_id: int, content_hash: str, report: str):
+	async with sessionmanager.session() as session:
+		await analysis_cache.set(
+			AnalysisRepository(session),
+			article_id,
+			content_hash,
+			PROMPT_VERSION,
+			report,
+		)
+
+
 async def get_from_ai(
 	db: AsyncSession,
 	id: int,
+	user_id: int,
 ):
 	(
 		status_code,
 		success,
 		message,
 		data,
-	) = await get_articles(db=db, id=id)
+	) = await get_articles(db=db, id=id, user_id=user_id)
 
 	if status_code != status.HTTP_200_OK:
 		return status_code, success, message, data
 
 	try:
-		content_json = json.loads(data)
-		summ_data = summarize_content(content_json['content'])
+		content_json = data.model_dump()
+		summ_data = await cached_analysis(
+			db, content_json['id'], content_json['content']
+		)
 
 		resp_data = AIAnalysis(
 			id=content_json['id'],
@@ -46,9 +183,75 @@ async def get_from_ai(
 			status.HTTP_200_OK,
 			True,
 			'Reply from GROQ based AI Agent',
-			resp_data.model_dump_json(),
+			resp_data,
+		)
+
+	except TimeoutError:
+		logger.info(f'AI analysis of article {id} timed out')
+		return (
+			status.HTTP_504_GATEWAY_TIMEOUT,
+			False,
+			'AI analysis is still running, please try again shortly',
+			None,
+		)
+	except LimiterFullError as e:
+		logger.info(f'AI agent is busy: {e}')
+		return (
+			status.HTTP_503_SERVICE_UNAVAILABLE,
+			False,
+			'AI agent is busy, please try again later',
+			None,
+		)
+	except Exception as e:
+		logger.error(f'Error retrieving from agent: {e}')
+		return (
+			status.HTTP_500_INTERNAL_SERVER_ERROR,
+			False,
+			'Failed to retrieve get reply from agent',
+			None,
+		)
+
+
+async def get_from_ai_stream(
+	db: AsyncSession,
+	id: int,
+	user_id: int,
+):
+	"""
+	Like `get_from_ai` but the data is an async generator of Server-Sent
+	Events: `chunk` events with the report text as it is generated, then
+	`done` with the full analysis, or `error`.
+	"""
+	(
+		status_code,
+		success,
+		message,
+		data,
+	) = await get_articles(db=db, id=id, user_id=user_id)
+
+	if status_code != status.HTTP_200_OK:
+		return status_code, success, message, data
+
+	try:
+		article = data.model_dump()
+		content_hash = analysis_hash(article['content'])
+		report = await analysis_cache.get(
+			AnalysisRepository(db), article['id'], content_hash
 		)
+		if report is None and llm_limiter.full:
+			return (
+				status.HTTP_503_SERVICE_UNAVAILABLE,
+				False,
+				'AI agent is busy, please try again later',
+				None,
+			)
 
+		return (
+			status.HTTP_200_OK,
+			True,
+			'Streaming reply from GROQ based AI Agent',
+			analysis_stream(article, content_hash, report),
+		)
 	except Exception as e:
 		logger.error(f'Error retrieving from agent: {e}')
 		return (
@@ -57,3 +260,213 @@ async def get_from_ai(
 			'Failed to retrieve get reply from agent',
 			None,
 		)
+
+
+async def analysis_stream(article: dict, content_hash: str, report: str):
+	try:
+		if report is not None:
+			yield sse_event({'text': report}, event='chunk')
+		else:
+			# The generation is registered like any other miss, so parallel
+			# streams and GET requests of the same content wait for it.
+			# Only the request that started it gets the chunks as they come.
+			chunks = asyncio.Queue()
+			task, leader = analysis_cache.flight.start(
+				(article['id'], content_hash),
+				lambda: stream_analysis(article, content_hash, chunks),
+			)
+			if leader:
+				while (chunk := await chunks.get()) is not None:
+					yield sse_event({'text': chunk}, event='chunk')
+			report = await asyncio.shield(task)
+			if not leader:
+				yield sse_event({'text': report}, event='chunk')
+
+		resp_data = AIAnalysis(
+			id=article['id'],
+			title=article['title'],
+			slug=article['slug'],
+			content=article['content'],
+			status=article['status'],
+			tags=article['tags'],
+			thumb_image=article['thumb_image'],
+			cover_image=article['cover_image'],
+			analysis_report=report,
+		)
+		yield sse_event(resp_data.model_dump_json(), event='done')
+
+	except LimiterFullError as e:
+		logger.info(f'AI agent is busy: {e}')
+		yield sse_event(
+			{'message': 'AI agent is busy, please try again later'},
+			event='error',
+		)
+	except Exception as e:
+		logger.error(f'Error streaming from agent: {e}')
+		yield sse_event(
+			{'message': 'Failed to retrieve get reply from agent'},
+			event='error',
+		)
+
+
+async def stream_analysis(
+	article: dict, content_hash: str, chunks: asyncio.Queue
+) -> str:
+	"""
+	Like `generate_analysis` but puts the report text on `chunks` as it is
+	generated, then None once the stream ends or fails.
+	"""
+	try:
+		report = analysis_cache.reports.get((article['id'], content_hash))
+		if report is not None:
+			chunks.put_nowait(report)
+			return report
+
+		sections = split_text(article['content'], config.AI_CHUNK_TOKENS)
+		if len(sections) == 1:
+			stream = astream_content(article['content'])
+		else:
+			stream = astream_reduce(
+				await analyse_sections(article['id'], sections)
+			)
+
+		parts = []
+		async for chunk in stream:
+			parts.append(chunk)
+			chunks.put_nowait(chunk)
+	finally:
+		chunks.put_nowait(None)
+
+	report = ''.join(parts)
+	await store_analysis(article['id'], content_hash, report)
+	return report
+
+
+async def cache_stats():
+	return (
+		status.HTTP_200_OK,
+		True,
+		'AI analysis cache stats',
+		analysis_cache.stats(),
+	)
+
+
+async def run_analysis_job(job: AnalysisJobResponse) -> str:
+	"""
+	Job handler of the analysis workers. The session is only held for the
+	lookups, not while the LLM is running.
+	"""
+	async with sessionmanager.session() as session:
+		article = await ArticleRepository(session).get_by_field(
+			'id', job.article_id
+		)
+		if not article:
+			raise ValueError(f'Article with id {job.article_id} not found')
+
+		content = article.content
+		content_hash = analysis_hash(content)
+		report = await analysis_cache.get(
+			AnalysisRepository(session), job.article_id, content_hash
+		)
+
+	if report is not None:
+		return report
+	return await coalesced_analysis(job.article_id, content, content_hash)
+
+
+async def create_analysis_job(
+	db: AsyncSession,
+	id: int,
+	user_id: int,
+):
+	(
+		status_code,
+		success,
+		message,
+		data,
+	) = await get_articles(db=db, id=id, user_id=user_id)
+
+	if status_code != status.HTTP_200_OK:
+		return status_code, success, message, data
+
+	try:
+		job = await analysis_jobs.submit(id, user_id)
+		return (
+			status.HTTP_202_ACCEPTED,
+			True,
+			'Analysis job queued',
+			job,
+		)
+	except Exception as e:
+		logger.error(f'Error creating analysis job: {e}')
+		return (
+			status.HTTP_500_INTERNAL_SERVER_ERROR,
+			False,
+			'Failed to create analysis job',
+			None,
+		)
+
+
+async def get_analysis_job(job_id: str, user: dict):
+	try:
+		job = await analysis_jobs.store.get(job_id)
+		# Other users' jobs are reported as missing
+		if not job or (
+			job.user_id != user['id']
+			and user['role']['role'] != RoleEnum.ADMIN.value
+		):
+			return (
+				status.HTTP_404_NOT_FOUND,
+				False,
+				f'Job with id {job_id} not found',
+				None,
+			)
+
+		return (
+			status.HTTP_200_OK,
+			True,
+			'Analysis job retrieved successfully',
+			job,
+		)
+	except Exception as e:
+		logger.error(f'Error retrieving analysis job: {e}')
+		return (
+			status.HTTP_500_INTERNAL_SERVER_ERROR,
+			False,
+			'Failed to retrieve analysis job',
+			None,
+		)
+
+
+async def analysis_job_events(job_id: str, request: Request):
+	"""
+	Server-Sent Events of a job: a `status` event whenever the status
+	changes, then `result` or `error` once it is done.
+	"""
+	last_status = None
+	idle = 0.0
+	while not await request.is_disconnected():
+		job = await analysis_jobs.store.get(job_id)
+		if job is None:
+			yield sse_event({'id': job_id}, event='error')
+			return
+
+		if job.status != last_status:
+			last_status = job.status
+			idle = 0.0
+			yield sse_event(
+				job.model_dump(include={'id', 'status'}), event='status'
+			)
+		elif idle >= 15:
+			idle = 0.0
+			yield SSE_PING
+
+		if job.status == JobStatus.SUCCEEDED.value:
+			yield sse_event(job.model_dump(mode='json'), event='result')
+			return
+		if job.status == JobStatus.FAILED.value:
+			yield sse_event(job.model_dump(mode='json'), event='error')
+			return
+
+		await asyncio.sleep(config.AI_JOB_POLL_INTERVAL)
+		idle += config.AI_JOB_POLL_INTERVAL
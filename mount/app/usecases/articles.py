@@ -1,9 +1,14 @@
-import json
-
 from fastapi import status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Article
+from app.enums.articles import (
+	ArticleStatus,
+	ArticleView,
+	BulkAction,
+	SearchMode,
+)
+from app.enums.pagination import CountMode
 from app.repositories.article_repo import ArticleRepository
 from app.repositories.category_repo import CategoryRepository
 from app.schemas.articles import (
@@ -14,30 +19,33 @@ from app.schemas.articles import (
 	ArticleUpdate,
 	ArticleWithCatId,
 )
-from app.schemas.categories import CategoryResponse
-from app.schemas.users import UserResponse
-from app.utils.helpers import generate_unique_slug
+from app.utils.helpers import (
+	article_metadata,
+	generate_unique_slug,
+	validate_list,
+)
 from app.utils.logger import Logger
 
 logger = Logger(__name__)
 
+# Unique constraint on articles.slug and how often to pick a new slug when
+# a concurrent insert took it first
+SLUG_CONSTRAINT = 'articles_slug_key'
+SLUG_RETRIES = 3
 
-def article_response(article: Article):
-	article_resps = ArticleResponse(
-		id=article.id,
-		title=article.title,
-		slug=article.slug,
-		content=article.content,
-		status=article.status,
-		tags=article.tags,
-		thumb_image=article.thumb_image,
-		cover_image=article.cover_image,
-		author=UserResponse.model_validate(article.author.__dict__.copy()),
-		category=CategoryResponse.model_validate(
-			article.category.__dict__.copy()
-		),
-	)
-	return article_resps.model_dump_json()
+# Foreign key of articles.category_id
+CATEGORY_CONSTRAINT = 'articles_category_id_fkey'
+
+# Default columns of view=summary, what a list page shows
+SUMMARY_FIELDS = [
+	'id',
+	'title',
+	'slug',
+	'tags',
+	'thumb_image',
+	'excerpt',
+	'reading_time',
+]
 
 
 async def create_article(
@@ -49,37 +57,60 @@ async def create_article(
 	category_repo = CategoryRepository(db)
 
 	try:
-		slug = await generate_unique_slug(article_in.title, article_repo)
-
-		article_in_db = ArticleRequestForDB(
-			title=article_in.title,
-			slug=slug,
-			content=article_in.content,
-			status=article_in.status,
-			tags=article_in.tags,
-			thumb_image=article_in.thumb_image,
-			cover_image=article_in.cover_image,
-			author_id=user_id,
-			category_id=article_in.category_id,
-			author_name=user_id,
-		)
-
 		# category exists check:
 		category_id_exists = await category_repo.get_by_field(
-			'id', article_in_db.category_id
+			'id', article_in.category_id
 		)
 		if not category_id_exists:
 			return (
 				status.HTTP_404_NOT_FOUND,
 				False,
-				f'Category id {article_in_db.category_id} not exists.',
+				f'Category id {article_in.category_id} not exists.',
+				None,
+			)
+
+		# Another request can take the same slug between the lookup and the
+		# insert, the unique constraint catches it and a new slug is picked
+		for attempt in range(SLUG_RETRIES):
+			slug = await generate_unique_slug(
+				article_in.title, article_repo, retry=attempt > 0
+			)
+
+			article_in_db = ArticleRequestForDB(
+				title=article_in.title,
+				slug=slug,
+				content=article_in.content,
+				status=article_in.status,
+				tags=article_in.tags,
+				thumb_image=article_in.thumb_image,
+				cover_image=article_in.cover_image,
+				author_id=user_id,
+				category_id=article_in.category_id,
+				author_name=user_id,
+			)
+			try:
+				new_article = await article_repo.create(
+					{
+						**article_in_db.model_dump(),
+						**article_metadata(article_in_db.content),
+					}
+				)
+				break
+			except IntegrityError as e:
+				if not article_repo.violates(e, SLUG_CONSTRAINT):
+					raise e
+				logger.info(f'Slug {slug} was taken meanwhile, retrying')
+		else:
+			return (
+				status.HTTP_409_CONFLICT,
+				False,
+				'Could not find a free slug for this title, try again',
 				None,
 			)
 
-		new_article = await article_repo.create(article_in_db.model_dump())
 		new_article_resp = ArticleOnlyResponse.model_validate(
 			new_article.__dict__.copy()
-		).model_dump_json()
+		)
 
 		return (
 			status.HTTP_201_CREATED,
@@ -118,9 +149,7 @@ async def get_articles(
 				status.HTTP_200_OK,
 				True,
 				'Article retrieved successfully',
-				ArticleWithCatId.model_validate(
-					article.__dict__.copy()
-				).model_dump_json(),
+				ArticleWithCatId.model_validate(article.__dict__.copy()),
 			)
 		return (
 			status.HTTP_404_NOT_FOUND,
@@ -145,48 +174,64 @@ async def update_article(
 	db: AsyncSession,
 ):
 	article_repo = ArticleRepository(db)
-	category_repo = CategoryRepository(db)
 
 	try:
-		article = await article_repo.get_by_field('id', id)
-		if not article:
-			return (
-				status.HTTP_404_NOT_FOUND,
-				False,
-				f'Article with id {id} not found',
-				None,
+		updated_article_data = article_in.model_dump(exclude_unset=True)
+		expected_updated_at = updated_article_data.pop('updated_at', None)
+		if updated_article_data.get('content') is not None:
+			updated_article_data.update(
+				article_metadata(updated_article_data['content'])
 			)
 
-		if article.author_id != user_id:
+		# Ownership (and the version the client read) are checked by the
+		# UPDATE itself, the row is only read again when it matched nothing.
+		# The category's foreign key only fires once they passed.
+		conditions = {'author_id': user_id}
+		if expected_updated_at:
+			conditions['updated_at'] = expected_updated_at
+		try:
+			updated_article = await article_repo.update(
+				id, updated_article_data, conditions
+			)
+		except IntegrityError as e:
+			if not article_repo.violates(e, CATEGORY_CONSTRAINT):
+				raise e
 			return (
-				status.HTTP_403_FORBIDDEN,
+				status.HTTP_404_NOT_FOUND,
 				False,
-				'You are not authorized to update this article',
+				f'Category id {article_in.category_id} not exists.',
 				None,
 			)
 
-		if article_in.category_id:
-			category_id_exists = await category_repo.get_by_field(
-				'id', article_in.category_id
-			)
-			if not category_id_exists:
+		if not updated_article:
+			article = await article_repo.get_by_field('id', id)
+			if not article:
 				return (
 					status.HTTP_404_NOT_FOUND,
 					False,
-					f'Category id {article_in.category_id} not exists.',
+					f'Article with id {id} not found',
 					None,
 				)
-
-		updated_article_data = article_in.model_dump(exclude_unset=True)
-		updated_article = await article_repo.update(id, updated_article_data)
+			if article.author_id != user_id:
+				return (
+					status.HTTP_403_FORBIDDEN,
+					False,
+					'You are not authorized to update this article',
+					None,
+				)
+			return (
+				status.HTTP_409_CONFLICT,
+				False,
+				'Article was modified by another request, reload it and '
+				'try again',
+				None,
+			)
 
 		return (
 			status.HTTP_200_OK,
 			True,
 			'Article updated successfully',
-			ArticleWithCatId.model_validate(
-				updated_article.__dict__.copy()
-			).model_dump_json(),
+			ArticleWithCatId.model_validate(updated_article.__dict__.copy()),
 		)
 
 	except Exception as e:
@@ -207,16 +252,16 @@ async def delete_article(
 	article_repo = ArticleRepository(db)
 
 	try:
-		article = await article_repo.get_by_field('id', id)
-		if not article:
-			return (
-				status.HTTP_404_NOT_FOUND,
-				False,
-				f'Article with id {id} not found',
-				None,
-			)
-
-		if article.author_id != user_id:
+		deleted = await article_repo.delete('id', id, {'author_id': user_id})
+		if not deleted:
+			article = await article_repo.get_by_field('id', id)
+			if not article:
+				return (
+					status.HTTP_404_NOT_FOUND,
+					False,
+					f'Article with id {id} not found',
+					None,
+				)
 			return (
 				status.HTTP_403_FORBIDDEN,
 				False,
@@ -224,7 +269,6 @@ async def delete_article(
 				None,
 			)
 
-		await article_repo.delete('id', id)
 		return status.HTTP_200_OK, True, 'Article deleted successfully', None
 
 	except Exception as e:
@@ -244,26 +288,62 @@ async def search_articles(
 	tag: str = None,
 	limit: int = 10,
 	offset: int = 0,
+	mode: str = SearchMode.FULLTEXT.value,
+	count_mode: str = CountMode.EXACT.value,
+	cursor: str = None,
+	view: str = ArticleView.SUMMARY.value,
+	fields: str = None,
 ):
 	article_repo = ArticleRepository(db)
 
 	try:
-		total, articles = await article_repo.search(
-			keys=keys, category=category, tag=tag, limit=limit, offset=offset
+		if view == ArticleView.FULL.value:
+			if fields:
+				raise ValueError('fields can only be used with view=summary')
+			summary_fields = None
+		elif fields:
+			summary_fields = [
+				field.strip() for field in fields.split(',') if field.strip()
+			]
+			if not summary_fields:
+				raise ValueError('fields must name at least one column')
+		else:
+			summary_fields = SUMMARY_FIELDS
+
+		result = await article_repo.search(
+			keys=keys,
+			category=category,
+			tag=tag,
+			limit=limit,
+			offset=offset,
+			mode=mode,
+			count_mode=count_mode,
+			cursor=cursor,
+			fields=summary_fields,
 		)
 
-		articles_resp = []
-		for article in articles:
-			article_resp = article_response(article)
-			articles_resp.append(json.loads(article_resp))
+		if summary_fields:
+			articles_resp = result.items
+		else:
+			articles_resp = validate_list(ArticleResponse, result.items)
 
 		return (
 			status.HTTP_200_OK,
 			True,
 			'Articles retrieved successfully',
-			{'total': total, 'articles': articles_resp},
+			{
+				'total': result.total,
+				'total_exact': result.total_exact,
+				'next_cursor': result.next_cursor,
+				'prev_cursor': result.prev_cursor,
+				'articles': articles_resp,
+			},
 		)
 
+	except ValueError as e:
+		logger.info(f'Invalid search articles request: {e}')
+		return status.HTTP_400_BAD_REQUEST, False, str(e), None
+
 	except Exception as e:
 		logger.error(f'Error searching articles: {e}')
 		return (
@@ -272,3 +352,32 @@ async def search_articles(
 			'Failed to search articles',
 			None,
 		)
+
+
+async def bulk_articles(ids: list[int], action: str, db: AsyncSession):
+	article_repo = ArticleRepository(db)
+
+	try:
+		if action == BulkAction.DELETE.value:
+			affected = await article_repo.delete_many(ids=ids)
+		else:
+			affected = await article_repo.update_many(
+				{'status': ArticleStatus.ARCHIVED.value}, ids=ids
+			)
+
+		missing = sorted(set(ids) - set(affected))
+		return (
+			status.HTTP_200_OK,
+			True,
+			f'{len(affected)} articles {action}d',
+			{'action': action, 'affected': affected, 'missing': missing},
+		)
+
+	except Exception as e:
+		logger.error(f'Error in bulk {action} of articles: {e}')
+		return (
+			status.HTTP_500_INTERNAL_SERVER_ERROR,
+			False,
+			f'Failed to {action} articles',
+			None,
+		)
@@ -1,54 +1,50 @@
-import json
-
 from fastapi import status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Category
+from app.enums.pagination import CountMode
 from app.repositories.category_repo import CategoryRepository
 from app.schemas.categories import (
 	CategoryRequest,
 	CategoryResponse,
 )
-from app.utils.helpers import calculate_pagination, page_to_offset
+from app.utils.helpers import (
+	calculate_pagination,
+	page_to_offset,
+	validate_list,
+)
 from app.utils.logger import Logger
 
 logger = Logger(__name__)
 
 
-def book_category_response(book_author: Category):
-	book_author_resp = CategoryResponse(
-		id=book_author.id,
-		name=book_author.name,
-	)
-	return book_author_resp.model_dump_json()
-
-
 async def search(
 	category: str,
 	db: AsyncSession,
 	page: int = None,
 	limit: int = None,
+	count_mode: str = CountMode.EXACT.value,
 ):
 	category_repo = CategoryRepository(db)
 	try:
-		total, searched_category = await category_repo.search(
+		result = await category_repo.search(
 			category=category,
 			offset=page_to_offset(page, limit),
 			limit=limit,
+			count_mode=count_mode,
 		)
 
-		resp_results = []
-		for cat in searched_category:
-			cat_resp = book_category_response(cat)
-			resp_results.append(json.loads(cat_resp))
+		resp_results = validate_list(CategoryResponse, result.items)
 
 		return (
 			status.HTTP_200_OK,
 			True,
-			f'{total} data found!',
+			f'{result.total} data found!',
 			{
 				'pagination': calculate_pagination(
-					total_data=total, page=page, limit=limit
+					total_data=result.total,
+					page=page,
+					limit=limit,
+					total_exact=result.total_exact,
 				),
 				'data': resp_results,
 			},
@@ -76,14 +72,14 @@ async def create_category(category: CategoryRequest, db: AsyncSession):
 				'Category not created!',
 				None,
 			)
-		new_category_json = CategoryResponse.model_validate(
+		new_category_resp = CategoryResponse.model_validate(
 			new_category.__dict__.copy()
-		).model_dump_json()
+		)
 		return (
 			status.HTTP_201_CREATED,
 			True,
 			'Category created!',
-			new_category_json,
+			new_category_resp,
 		)
 	except Exception as e:
 		logger.error(f'Something went wrong with creating category: {e}')
@@ -110,9 +106,7 @@ async def get_category(category_id: int, db: AsyncSession):
 			status.HTTP_200_OK,
 			True,
 			'category retrieved successfully',
-			CategoryResponse.model_validate(
-				category.__dict__.copy()
-			).model_dump_json(),
+			CategoryResponse.model_validate(category.__dict__.copy()),
 		)
 
 	except Exception as e:
@@ -140,11 +134,8 @@ async def update_category(
 				None,
 			)
 
-		if category.name:
-			category_exists.name = category.name
-		updated_category = await category_repo.update(
-			category_id, category_exists.__dict__.copy()
-		)
+		changes = {'name': category.name} if category.name else {}
+		updated_category = await category_repo.update(category_id, changes)
 
 		if not updated_category:
 			logger.info('Category not updated!')
@@ -155,14 +146,14 @@ async def update_category(
 				None,
 			)
 
-		updated_category_json = CategoryResponse.model_validate(
+		updated_category_resp = CategoryResponse.model_validate(
 			updated_category.__dict__.copy()
-		).model_dump_json()
+		)
 		return (
 			status.HTTP_200_OK,
 			True,
 			'Category updated!',
-			updated_category_json,
+			updated_category_resp,
 		)
 	except Exception as e:
 		logger.error(f'Something went wrong with updating category: {e}')
@@ -178,8 +169,8 @@ async def delete_category(category_id: int, db: AsyncSession):
 	category_repo = CategoryRepository(db)
 
 	try:
-		category_exists = await category_repo.get_by_field('id', category_id)
-		if not category_exists:
+		deleted = await category_repo.delete('id', category_id)
+		if not deleted:
 			logger.info(f'Category with id {category_id} not found!')
 			return (
 				status.HTTP_404_NOT_FOUND,
@@ -188,7 +179,6 @@ async def delete_category(category_id: int, db: AsyncSession):
 				None,
 			)
 
-		_ = await category_repo.delete('id', category_id)
 		return status.HTTP_200_OK, True, 'Category deleted!', None
 	except Exception as e:
 		logger.error(f'Something went wrong with deleting category: {e}')
@@ -0,0 +1,12 @@
+from fastapi import status
+
+from app.services.connection import sessionmanager
+
+
+async def pool_stats():
+	return (
+		status.HTTP_200_OK,
+		True,
+		'Database pool stats',
+		sessionmanager.pool_stats(),
+	)
@@ -1,8 +1,7 @@
-import json
-
 from fastapi import status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.enums.pagination import CountMode
 from app.enums.roles import RoleEnum
 from app.enums.tokens import TokenType
 from app.models import User
@@ -16,7 +15,14 @@ from app.schemas.users import (
 	UserUpdate,
 	UserWithRoleId,
 )
-from app.utils.helpers import calculate_pagination, page_to_offset
+from app.services.connection import release
+from app.services.principal_cache import principal_cache
+from app.services.revocation import revocations
+from app.utils.helpers import (
+	calculate_pagination,
+	page_to_offset,
+	validate_list,
+)
 from app.utils.logger import Logger
 from app.utils.password_utils import PasswordHasher
 from app.utils.token import Token
@@ -46,14 +52,12 @@ async def auth(user_id: int, db: AsyncSession):
 			else None,
 		)
 
-		new_data_json = new_data_resp.model_dump_json()
-
 		return (
 			status.HTTP_200_OK,
 			True,
 			'Authenticated!',
 			{
-				'data': new_data_json,
+				'data': new_data_resp,
 			},
 		)
 
@@ -87,7 +91,9 @@ async def login(user_credentials: LoginRequest, db: AsyncSession):
 				None,
 			)
 
-		verify_password = PasswordHasher.verify_password(
+		# Hashing takes a while and needs no connection
+		await release(db)
+		verify_password = await PasswordHasher.averify_password(
 			user_credentials.password, user_exists.hashed_password
 		)
 		if not verify_password:
@@ -179,7 +185,10 @@ async def signup(user_data: UserRequest, db: AsyncSession):
 					None,
 				)
 
-		hashed_password = PasswordHasher.hash_password(user_data.password)
+		await release(db)
+		hashed_password = await PasswordHasher.ahash_password(
+			user_data.password
+		)
 
 		user_db_in = UserWithRoleId(
 			**user_data.model_dump(),
@@ -201,13 +210,11 @@ async def signup(user_data: UserRequest, db: AsyncSession):
 			else None,
 		)
 
-		new_data_json = new_data_resp.model_dump_json()
-
 		return (
 			status.HTTP_201_CREATED,
 			True,
 			'Signup successful! Welcome aboard!',
-			new_data_json,
+			new_data_resp,
 		)
 	except Exception as e:
 		logger.error(f'Something went wrong with user data: {e}')
@@ -243,7 +250,7 @@ async def get_user_by_id(
 				status.HTTP_200_OK,
 				True,
 				'User found!',
-				user_resp.model_dump_json(),
+				user_resp,
 			)
 		else:
 			return status.HTTP_404_NOT_FOUND, True, 'User not found!', {}
@@ -267,16 +274,13 @@ async def update(user_id: int, user_data: UserUpdate, db: AsyncSession):
 			logger.info('User not found!')
 			return status.HTTP_404_NOT_FOUND, False, 'User not found!', None
 
-		if user_data.email:
-			user_exists.email = user_data.email
-		if user_data.full_name:
-			user_exists.full_name = user_data.full_name
-		if user_data.photo:
-			user_exists.photo = user_data.photo
-
-		new_user: User = await user_repo.update(
-			user_id, user_exists.__dict__.copy()
-		)
+		changes = {
+			field: value
+			for field, value in user_data.model_dump().items()
+			if value
+		}
+		new_user: User = await user_repo.update(user_id, changes)
+		principal_cache.pop(user_id)
 
 		new_data_resp = UserResponse(
 			id=new_user.id,
@@ -290,9 +294,7 @@ async def update(user_id: int, user_data: UserUpdate, db: AsyncSession):
 			else None,
 		)
 
-		new_data_json = new_data_resp.model_dump_json()
-
-		return status.HTTP_202_ACCEPTED, True, 'User updated!', new_data_json
+		return status.HTTP_202_ACCEPTED, True, 'User updated!', new_data_resp
 	except Exception as e:
 		logger.error(f'Something went wrong with user data: {e}')
 		return (
@@ -318,8 +320,9 @@ async def update_password(
 			logger.info('User not found!')
 			return status.HTTP_404_NOT_FOUND, False, 'User not found!', None
 
+		await release(db)
 		if check_old_password:
-			verify_password = PasswordHasher.verify_password(
+			verify_password = await PasswordHasher.averify_password(
 				old_password, user_exists.hashed_password
 			)
 			if not verify_password:
@@ -331,12 +334,12 @@ async def update_password(
 					None,
 				)
 
-		new_hashed_password = PasswordHasher.hash_password(new_password)
-		user_exists.hashed_password = new_hashed_password
+		new_hashed_password = await PasswordHasher.ahash_password(new_password)
 
 		user_update: User = await user_repo.update(
-			user_id, user_exists.__dict__.copy()
+			user_id, {'hashed_password': new_hashed_password}
 		)
+		principal_cache.pop(user_id)
 		if user_update:
 			return status.HTTP_202_ACCEPTED, True, 'Password updated!', None
 		else:
@@ -363,32 +366,23 @@ async def search(
 	page: int,
 	limit: int,
 	db: AsyncSession,
+	count_mode: str = CountMode.EXACT.value,
+	cursor: str = None,
 ):
 	user_repo = UserRepository(db)
 
 	try:
-		total, users = await user_repo.search(
+		result = await user_repo.search(
 			key,
 			role,
 			is_active,
 			offset=page_to_offset(page, limit),
 			limit=limit,
+			count_mode=count_mode,
+			cursor=cursor,
 		)
-		if users:
-			all_users = []
-			for user in users:
-				user_resp = UserResponse(
-					id=user.id,
-					username=user.username,
-					email=user.email,
-					full_name=user.full_name,
-					is_active=user.is_active,
-					photo=user.photo,
-					role=RoleResponse.model_validate(user.role.__dict__.copy())
-					if user.role
-					else None,
-				)
-				all_users.append(json.loads(user_resp.model_dump_json()))
+		if result.items:
+			all_users = validate_list(UserResponse, result.items)
 
 			return (
 				status.HTTP_200_OK,
@@ -396,7 +390,12 @@ async def search(
 				'Users found!',
 				{
 					'pagination': calculate_pagination(
-						total_data=total, page=page, limit=limit
+						total_data=result.total,
+						page=page,
+						limit=limit,
+						total_exact=result.total_exact,
+						next_cursor=result.next_cursor,
+						prev_cursor=result.prev_cursor,
 					),
 					'data': all_users,
 				},
@@ -404,6 +403,9 @@ async def search(
 		else:
 			return status.HTTP_200_OK, True, 'Users not found!', {}
 
+	except ValueError as e:
+		logger.info(f'Invalid user search request: {e}')
+		return status.HTTP_400_BAD_REQUEST, False, str(e), None
 	except Exception as e:
 		logger.error(f'Something went wrong with user data: {e}')
 		return (
@@ -420,12 +422,15 @@ async def user_status_change(user_id: int, db: AsyncSession):
 	try:
 		user: User = await user_repo.get_by_field('id', user_id)
 		if user:
-			if user.is_active:
-				user.is_active = False
-			else:
-				user.is_active = True
-			await user_repo.update(user_id, user.__dict__.copy())
+			# The status change and its revocation NOTIFY commit together
+			user = await user_repo.update(
+				user_id, {'is_active': not user.is_active}, commit=False
+			)
+			await revocations.publish(
+				user_repo, user_id, revoked=not user.is_active
+			)
 			await db.commit()
+			principal_cache.pop(user_id)
 			return (
 				status.HTTP_200_OK,
 				True,
@@ -0,0 +1,64 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+	"""
+	Small in-process least recently used cache.
+	"""
+
+	def __init__(self, maxsize: int = 1024):
+		self.maxsize = maxsize
+		self._data: OrderedDict = OrderedDict()
+
+	def __len__(self) -> int:
+		return len(self._data)
+
+	def get(self, key: Hashable) -> Optional[Any]:
+		if key not in self._data:
+			return None
+		self._data.move_to_end(key)
+		return self._data[key]
+
+	def set(self, key: Hashable, value: Any):
+		self._data[key] = value
+		self._data.move_to_end(key)
+		while len(self._data) > self.maxsize:
+			self._data.popitem(last=False)
+
+	def pop(self, key: Hashable) -> Optional[Any]:
+		return self._data.pop(key, None)
+
+	def clear(self):
+		self._data.clear()
+
+
+class TTLCache(LRUCache):
+	"""
+	LRU cache whose entries also expire `ttl` seconds after they are set.
+	A `ttl` of 0 disables caching.
+	"""
+
+	def __init__(self, maxsize: int = 1024, ttl: float = 60):
+		super().__init__(maxsize)
+		self.ttl = ttl
+
+	def get(self, key: Hashable) -> Optional[Any]:
+		entry = super().get(key)
+		if entry is None:
+			return None
+		expires_at, value = entry
+		if expires_at <= time.monotonic():
+			self.pop(key)
+			return None
+		return value
+
+	def set(self, key: Hashable, value: Any):
+		if self.ttl <= 0:
+			return
+		super().set(key, (time.monotonic() + self.ttl, value))
+
+	def pop(self, key: Hashable) -> Optional[Any]:
+		entry = super().pop(key)
+		return entry[1] if entry is not None else None
@@ -0,0 +1,55 @@
+import asyncio
+
+
+class LimiterFullError(Exception):
+	pass
+
+
+class ConcurrencyLimiter:
+	"""
+	Async context manager allowing `max_concurrency` holders at a time and
+	at most `max_queue` waiters behind them. Once the queue is full new
+	callers fail fast with LimiterFullError instead of piling up.
+	"""
+
+	def __init__(self, max_concurrency: int, max_queue: int):
+		self.max_concurrency = max_concurrency
+		self.max_queue = max_queue
+		self._semaphore = asyncio.Semaphore(max_concurrency)
+		self._active = 0
+		self._waiting = 0
+
+	@property
+	def active(self) -> int:
+		return self._active
+
+	@property
+	def waiting(self) -> int:
+		return self._waiting
+
+	@property
+	def full(self) -> bool:
+		return self._semaphore.locked() and self._waiting >= self.max_queue
+
+	async def acquire(self):
+		if self.full:
+			raise LimiterFullError(
+				f'{self._waiting} requests already waiting for a free slot'
+			)
+		self._waiting += 1
+		try:
+			await self._semaphore.acquire()
+		finally:
+			self._waiting -= 1
+		self._active += 1
+
+	def release(self):
+		self._active -= 1
+		self._semaphore.release()
+
+	async def __aenter__(self):
+		await self.acquire()
+		return self
+
+	async def __aexit__(self, exc_type, exc, tb):
+		self.release()
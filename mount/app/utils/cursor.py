@@ -0,0 +1,47 @@
+import base64
+import json
+from datetime import datetime
+
+NEXT = 'next'
+PREV = 'prev'
+
+
+def encode_cursor(values: list, direction: str = NEXT) -> str:
+	"""
+	Packs the sort key of a row into an opaque, url safe token.
+	"""
+	payload = json.dumps(
+		{'k': [_encode_value(value) for value in values], 'd': direction},
+		separators=(',', ':'),
+	)
+	return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> tuple[list, str]:
+	"""
+	Unpacks a token made by `encode_cursor`. Raises ValueError if invalid,
+	cursors come from clients and may have been tampered with.
+	"""
+	try:
+		padded = cursor + '=' * (-len(cursor) % 4)
+		payload = json.loads(base64.urlsafe_b64decode(padded))
+		values, direction = payload['k'], payload['d']
+		if direction not in (NEXT, PREV) or not isinstance(values, list):
+			raise ValueError('Invalid cursor')
+		return [_decode_value(value) for value in values], direction
+	except (ValueError, TypeError, KeyError) as e:
+		raise ValueError('Invalid cursor') from e
+
+
+def _encode_value(value):
+	if isinstance(value, datetime):
+		return {'dt': value.isoformat()}
+	return value
+
+
+def _decode_value(value):
+	if isinstance(value, dict) and value.keys() == {'dt'}:
+		return datetime.fromisoformat(value['dt'])
+	if value is None or isinstance(value, (str, int, float)):
+		return value
+	raise ValueError(f'Invalid cursor value {value!r}')
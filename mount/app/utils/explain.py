@@ -0,0 +1,25 @@
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class Explain(Executable, ClauseElement):
+	"""
+	Wraps a statement in EXPLAIN so it can be run through a session.
+	"""
+
+	inherit_cache = False
+
+	def __init__(self, statement, analyze: bool = False, format: str = 'json'):
+		self.statement = statement
+		self.analyze = analyze
+		self.format = format
+
+
+@compiles(Explain, 'postgresql')
+def compile_explain(element: Explain, compiler, **kw):
+	options = []
+	if element.analyze:
+		options += ['ANALYZE', 'BUFFERS']
+	options.append(f'FORMAT {element.format.upper()}')
+	statement = compiler.process(element.statement, **kw)
+	return f'EXPLAIN ({", ".join(options)}) {statement}'
@@ -1,13 +1,38 @@
+import re
+import secrets
+import string
+import zlib
+from functools import cache
+from typing import Any, Iterable, Type, TypeVar
+
+from app.models.articles import EXCERPT_CHARS, WORDS_PER_MINUTE
 from app.repositories.base_repo import BaseRepository
+from pydantic import BaseModel, TypeAdapter
 from slugify import slugify
 
+M = TypeVar('M', bound=BaseModel)
+
+# Rough average for English text, good enough to stay under a context window
+CHARS_PER_TOKEN = 4
+
+# Length of the random suffix of a slug picked after a conflict, letters
+# only so it never reads as a numeric `slug-N`
+SLUG_RANDOM_CHARS = 6
+
 
 def page_to_offset(page: int, limit: int):
 	offset = (page - 1) * limit
 	return offset
 
 
-def calculate_pagination(total_data: int, page: int, limit: int):
+def calculate_pagination(
+	total_data: int,
+	page: int,
+	limit: int,
+	total_exact: bool = True,
+	next_cursor: str = None,
+	prev_cursor: str = None,
+):
 	# Ensure limit is valid
 	if limit <= 0:
 		raise ValueError('Limit must be greater than 0.')
@@ -24,22 +49,124 @@ def calculate_pagination(total_data: int, page: int, limit: int):
 	# Return pagination details
 	return {
 		'total_data': total_data,
+		'total_exact': total_exact,
 		'total_pages': total_pages,
 		'current_page': current_page,
 		'prev_page': page_before,
 		'next_page': page_after,
+		'next_cursor': next_cursor,
+		'prev_cursor': prev_cursor,
 	}
 
 
-async def generate_unique_slug(name: str, repo: BaseRepository):
+async def generate_unique_slug(
+	name: str, repo: BaseRepository, retry: bool = False
+):
+	"""
+	`name` slugified, with the next free numeric suffix when taken. Two
+	concurrent callers can get the same slug, so the insert must still
+	handle the unique violation. On a `retry` after one, the slug gets a
+	random letter suffix instead: every contender would compute the same
+	next number again.
+	"""
 	slug_data = slugify(name)
-	slug_exists = await repo.get_by_field('slug', slug_data)
-	slug_count = 0
-	while slug_exists:
-		slug_count += 1
-		temp_slug_data = slug_data + '-' + str(slug_count)
-		temp_slug_exists = await repo.get_by_field('slug', temp_slug_data)
-		if not temp_slug_exists:
-			slug_data = temp_slug_data
-			break
-	return slug_data
+	if retry:
+		suffix = ''.join(
+			secrets.choice(string.ascii_lowercase)
+			for _ in range(SLUG_RANDOM_CHARS)
+		)
+		return f'{slug_data}-{suffix}'
+
+	taken, highest = await repo.slug_usage(slug_data)
+	if not taken:
+		return slug_data
+	return f'{slug_data}-{(highest or 0) + 1}'
+
+
+def article_metadata(content: str) -> dict:
+	"""
+	Excerpt, word count and reading time (in minutes) of an article's
+	content. The excerpt is cut at the last whole word the same way as
+	the summary listing's fallback in ArticleRepository.
+	"""
+	if len(content) <= EXCERPT_CHARS:
+		excerpt = content
+	else:
+		excerpt = re.sub(r'\s+\S*$', '', content[:EXCERPT_CHARS]) + '…'
+
+	word_count = len(content.split())
+	return {
+		'excerpt': excerpt,
+		'word_count': word_count,
+		'reading_time': max(1, -(-word_count // WORDS_PER_MINUTE)),
+	}
+
+
+@cache
+def list_adapter(schema: Type[M]) -> TypeAdapter:
+	return TypeAdapter(list[schema])
+
+
+def validate_list(schema: Type[M], items: Iterable[Any]) -> list[M]:
+	"""
+	Converts ORM objects (or dicts) to `schema` models in a single
+	validation call, reading attributes directly instead of copying each
+	row's __dict__.
+	"""
+	return list_adapter(schema).validate_python(
+		list(items), from_attributes=True
+	)
+
+
+def estimate_tokens(text: str) -> int:
+	return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def split_text(text: str, max_tokens: int) -> list[str]:
+	"""
+	Splits `text` into sections of at most `max_tokens` (estimated) on
+	paragraph boundaries. Whether a section ends after a paragraph depends
+	on that paragraph's content rather than on running offsets, so editing
+	one paragraph leaves the other sections unchanged in most cases.
+
+	Sections are at least half full before such a boundary can end them
+	and average about two thirds of `max_tokens`, so expect around
+	1.5 * estimate_tokens(text) / max_tokens sections.
+	"""
+	if estimate_tokens(text) <= max_tokens:
+		return [text]
+
+	max_chars = max_tokens * CHARS_PER_TOKEN
+	min_chars = max_chars // 2
+	sections = []
+	current = ''
+	for paragraph in re.split(r'\n\s*\n', text.strip()):
+		paragraph = paragraph.strip()
+		if not paragraph:
+			continue
+
+		# Paragraphs longer than a section are cut at the last space
+		while len(paragraph) > max_chars:
+			cut = paragraph.rfind(' ', 0, max_chars)
+			cut = cut if cut > 0 else max_chars
+			if current:
+				sections.append(current)
+				current = ''
+			sections.append(paragraph[:cut].strip())
+			paragraph = paragraph[cut:].strip()
+
+		if current and len(current) + len(paragraph) + 2 > max_chars:
+			sections.append(current)
+			current = ''
+		current = f'{current}\n\n{paragraph}' if current else paragraph
+
+		if (
+			len(current) >= min_chars
+			and zlib.crc32(paragraph.encode()) % 3 == 0
+		):
+			sections.append(current)
+			current = ''
+
+	if current:
+		sections.append(current)
+	return sections
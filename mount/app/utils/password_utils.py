@@ -1,5 +1,17 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 
+from app.services.config import config
+
+# bcrypt releases the GIL while hashing, so a few threads are enough to
+# keep it off the event loop. The pool size also caps how much CPU a
+# login burst can take from the rest of the process.
+hash_executor = ThreadPoolExecutor(
+	max_workers=config.PASSWORD_HASH_WORKERS, thread_name_prefix='bcrypt'
+)
+
 
 class PasswordHasher:
 	@staticmethod
@@ -19,3 +31,26 @@ class PasswordHasher:
 		password_bytes = password.encode('utf-8')
 		hashed_password_bytes = hashed_password.encode('utf-8')
 		return bcrypt.checkpw(password_bytes, hashed_password_bytes)
+
+	@staticmethod
+	async def ahash_password(password: str) -> str:
+		"""
+		`hash_password` on the hashing thread pool.
+		"""
+		loop = asyncio.get_running_loop()
+		return await loop.run_in_executor(
+			hash_executor, PasswordHasher.hash_password, password
+		)
+
+	@staticmethod
+	async def averify_password(password: str, hashed_password: str) -> bool:
+		"""
+		`verify_password` on the hashing thread pool.
+		"""
+		loop = asyncio.get_running_loop()
+		return await loop.run_in_executor(
+			hash_executor,
+			PasswordHasher.verify_password,
+			password,
+			hashed_password,
+		)
@@ -1,15 +1,22 @@
-import json
+from typing import Any
 
 from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class PydanticJSONResponse(JSONResponse):
+	"""
+	JSONResponse rendered by pydantic-core, so models, datetimes and
+	nested containers of them are encoded in one pass without a
+	`model_dump` first.
+	"""
+
+	def render(self, content: Any) -> bytes:
+		return to_json(content)
 
 
 def standard_response(status, success, message, data):
-	if isinstance(data, str):
-		try:
-			data = json.loads(data)
-		except json.JSONDecodeError:
-			pass
-	return JSONResponse(
+	return PydanticJSONResponse(
 		status_code=status,
 		content={'success': success, 'message': message, 'data': data},
 	)
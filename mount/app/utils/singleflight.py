@@ -0,0 +1,59 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, Optional
+
+
+class SingleFlight:
+	"""
+	Runs at most one call per key at a time. Callers arriving while a call
+	for their key is in flight await that same call instead of starting
+	another one.
+
+	The shared task is shielded: a caller that times out or is cancelled
+	(e.g. its client disconnected) stops waiting, but the work carries on
+	for everybody else.
+	"""
+
+	def __init__(self):
+		self._tasks: dict[Hashable, asyncio.Task] = {}
+		self.coalesced = 0
+
+	@property
+	def in_flight(self) -> int:
+		return len(self._tasks)
+
+	def __contains__(self, key: Hashable) -> bool:
+		return key in self._tasks
+
+	def start(
+		self, key: Hashable, func: Callable[[], Awaitable]
+	) -> tuple[asyncio.Task, bool]:
+		"""
+		The call in flight for `key`, started from `func` when there is
+		none, and whether this caller started it.
+		"""
+		task = self._tasks.get(key)
+		if task is not None:
+			self.coalesced += 1
+			return task, False
+
+		task = asyncio.create_task(func())
+		self._tasks[key] = task
+		task.add_done_callback(lambda done: self._forget(key, done))
+		return task, True
+
+	async def do(
+		self,
+		key: Hashable,
+		func: Callable[[], Awaitable],
+		timeout: Optional[float] = None,
+	):
+		task, _ = self.start(key, func)
+		return await asyncio.wait_for(asyncio.shield(task), timeout)
+
+	def _forget(self, key: Hashable, task: asyncio.Task):
+		if self._tasks.get(key) is task:
+			del self._tasks[key]
+		# Nobody may be waiting anymore, retrieve the error to keep asyncio
+		# from logging "exception was never retrieved".
+		if not task.cancelled():
+			task.exception()
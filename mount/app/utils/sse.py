@@ -0,0 +1,17 @@
+import json
+from typing import Any, Optional
+
+# Comment line, keeps proxies from closing an idle stream
+SSE_PING = ': ping\n\n'
+
+
+def sse_event(data: Any, event: Optional[str] = None) -> str:
+	"""
+	Formats one Server-Sent Event. Non string data is sent as JSON.
+	"""
+	if not isinstance(data, str):
+		data = json.dumps(data, default=str)
+
+	lines = [f'event: {event}'] if event else []
+	lines.extend(f'data: {line}' for line in data.split('\n'))
+	return '\n'.join(lines) + '\n\n'
@@ -27,7 +27,7 @@ class Token:
 			to_encode['token_type'] = TokenType.ACCESS_TOKEN.value
 			expire = datetime.now(timezone.utc) + expires_delta
 
-		to_encode.update({'exp': expire})
+		to_encode.update({'exp': expire, 'iat': datetime.now(timezone.utc)})
 		encoded_jwt = jwt.encode(
 			to_encode, config.SECRET_KEY, algorithm=config.ALGORITHM
 		)
@@ -50,6 +50,7 @@ class Token:
 			full_name = payload.get('full_name')
 			photo = payload.get('photo')
 			role = payload.get('role')
+			iat = payload.get('iat')
 
 			if user_id is None:
 				raise status.HTTP_404_NOT_FOUND
@@ -61,6 +62,7 @@ class Token:
 				full_name=full_name,
 				photo=photo,
 				role=role,
+				iat=iat,
 			)
 			return token_data
 
@@ -0,0 +1,97 @@
+"""
+Database round trips and latency of PATCH /articles/{id}.
+
+	python benchmarks/article_update.py --identifier admin --password password1
+	python benchmarks/article_update.py --requests 500 --content
+
+Creates a scratch article owned by the given account, patches it
+`--requests` times and deletes it again. Round trips are the statements
+sent plus the commits. Runs the app in-process against the configured
+database.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from app.main import app
+from app.services.connection import sessionmanager
+from app.services.lifespan import lifespan
+from sqlalchemy import event
+
+
+async def main(args):
+	counts = {'statements': 0, 'commits': 0}
+
+	def on_statement(*_):
+		counts['statements'] += 1
+
+	def on_commit(*_):
+		counts['commits'] += 1
+
+	async with lifespan(app):
+		engine = sessionmanager._engine.sync_engine
+		event.listen(engine, 'before_cursor_execute', on_statement)
+		event.listen(engine, 'commit', on_commit)
+
+		transport = httpx.ASGITransport(app=app)
+		async with httpx.AsyncClient(
+			transport=transport, base_url='http://bench'
+		) as client:
+			response = await client.post(
+				'/api/v1/users/login',
+				json={
+					'identifier': args.identifier,
+					'password': args.password,
+				},
+			)
+			token = response.json()['data']['access_token']
+			headers = {'Authorization': f'Bearer {token}'}
+
+			response = await client.post(
+				'/api/v1/articles/',
+				json={
+					'title': 'Update benchmark',
+					'content': 'benchmark',
+					'category_id': args.category_id,
+					'status': 'draft',
+				},
+				headers=headers,
+			)
+			article_id = response.json()['data']['id']
+			path = f'/api/v1/articles/{article_id}'
+
+			# Warms the principal cache
+			await client.patch(path, json={'title': 'warm'}, headers=headers)
+
+			timings = []
+			counts.update(statements=0, commits=0)
+			for i in range(args.requests):
+				body = {'title': f'Update benchmark {i}'}
+				if args.content:
+					body['content'] = f'benchmark content {i} ' * 50
+				started = time.perf_counter()
+				response = await client.patch(path, json=body, headers=headers)
+				timings.append((time.perf_counter() - started) * 1000)
+				assert response.status_code == 200, response.text
+
+			await client.delete(path, headers=headers)
+
+	timings.sort()
+	print(f'requests      {args.requests}')
+	print(f'statements    {counts["statements"] / args.requests:.1f} / req')
+	print(f'commits       {counts["commits"] / args.requests:.1f} / req')
+	print(f'p50           {statistics.median(timings):.2f} ms')
+	print(f'p95           {timings[int(len(timings) * 0.95) - 1]:.2f} ms')
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument('--identifier', default='admin')
+	parser.add_argument('--password', default='password1')
+	parser.add_argument('--category-id', type=int, default=1)
+	parser.add_argument('--requests', type=int, default=200)
+	parser.add_argument('--content', action='store_true')
+	asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,84 @@
+"""
+Connections checked out of the pool, and queries run, per authenticated
+request.
+
+	python benchmarks/auth_checkouts.py --identifier admin --password password1
+	python benchmarks/auth_checkouts.py --no-cache  # bypass principal cache
+
+Needs an admin account. Runs the app in-process against the configured
+database.
+"""
+
+import argparse
+import asyncio
+
+import httpx
+from app.main import app
+from app.services.connection import sessionmanager
+from app.services.lifespan import lifespan
+from app.services.principal_cache import principal_cache
+from sqlalchemy import event
+
+ROUTES = [
+	('GET', '/api/v1/users/auth'),
+	('GET', '/api/v1/admin/users/?limit=5'),
+	('GET', '/api/v1/ai-agent/cache/stats'),
+	('GET', '/api/v1/articles/?limit=5'),
+]
+
+
+async def main(args):
+	if args.no_cache:
+		principal_cache.ttl = 0
+
+	counts = {'checkouts': 0, 'queries': 0}
+
+	def on_checkout(*_):
+		counts['checkouts'] += 1
+
+	def on_query(*_):
+		counts['queries'] += 1
+
+	async with lifespan(app):
+		engine = sessionmanager._engine.sync_engine
+		event.listen(engine.pool, 'checkout', on_checkout)
+		event.listen(engine, 'before_cursor_execute', on_query)
+
+		transport = httpx.ASGITransport(app=app)
+		async with httpx.AsyncClient(
+			transport=transport, base_url='http://bench'
+		) as client:
+			response = await client.post(
+				'/api/v1/users/login',
+				json={
+					'identifier': args.identifier,
+					'password': args.password,
+				},
+			)
+			token = response.json()['data']['access_token']
+			headers = {'Authorization': f'Bearer {token}'}
+
+			print(
+				f'{"route":<40} {"status":>6} {"checkouts":>9} {"queries":>7}'
+			)
+			for method, path in ROUTES:
+				# First call warms the principal cache
+				await client.request(method, path, headers=headers)
+				for _ in range(args.repeat):
+					counts.update(checkouts=0, queries=0)
+					response = await client.request(
+						method, path, headers=headers
+					)
+				print(
+					f'{method + " " + path:<40} {response.status_code:>6} '
+					f'{counts["checkouts"]:>9} {counts["queries"]:>7}'
+				)
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument('--identifier', default='admin')
+	parser.add_argument('--password', default='password1')
+	parser.add_argument('--repeat', type=int, default=3)
+	parser.add_argument('--no-cache', action='store_true')
+	asyncio.run(main(parser.parse_args()))
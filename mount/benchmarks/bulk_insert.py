@@ -0,0 +1,115 @@
+"""
+Inserting many articles: ORM add_all with a refresh per row, batched
+INSERT ... RETURNING (BaseRepository.create_all) and COPY
+(BaseRepository.copy_all).
+
+	python benchmarks/bulk_insert.py --rows 100000
+	python benchmarks/bulk_insert.py --rows 100000 --skip-orm
+	python benchmarks/bulk_insert.py --batch-size 5000
+
+Rows are written for the first user and category and deleted again
+afterwards. Runs against the configured database.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from app.models import Article
+from app.repositories.article_repo import ArticleRepository
+from app.services.config import config
+from app.services.connection import sessionmanager
+from app.utils.helpers import article_metadata
+from sqlalchemy import event
+
+CONTENT = 'Benchmark article body with a handful of words. ' * 8
+
+
+def make_rows(prefix: str, count: int) -> list[dict]:
+	metadata = article_metadata(CONTENT)
+	return [
+		{
+			'title': f'Bulk insert {i}',
+			'slug': f'{prefix}-{i}',
+			'content': CONTENT,
+			'status': 'draft',
+			'tags': ['bench'],
+			'thumb_image': '',
+			'cover_image': '',
+			'author_id': 1,
+			'category_id': 1,
+			**metadata,
+		}
+		for i in range(count)
+	]
+
+
+async def orm_refresh(repo: ArticleRepository, rows: list[dict]) -> int:
+	# What create_all used to do
+	items = [Article(**row) for row in rows]
+	repo.db.add_all(items)
+	await repo.db.commit()
+	for item in items:
+		await repo.db.refresh(item)
+	return len(items)
+
+
+async def insert_returning(repo: ArticleRepository, rows: list[dict]) -> int:
+	return len(await repo.create_all(rows, batch_size=args.batch_size))
+
+
+async def copy(repo: ArticleRepository, rows: list[dict]) -> int:
+	return await repo.copy_all(rows)
+
+
+async def main():
+	sessionmanager.init(config.db_dsn)
+	counts = {'statements': 0}
+
+	def on_statement(*_):
+		counts['statements'] += 1
+
+	event.listen(
+		sessionmanager._engine.sync_engine,
+		'before_cursor_execute',
+		on_statement,
+	)
+
+	modes = [('insert returning', insert_returning), ('copy', copy)]
+	if not args.skip_orm:
+		modes.insert(0, ('orm + refresh', orm_refresh))
+
+	print(
+		f'{"mode":<18} {"rows":>8} {"seconds":>8} {"rows/s":>9} {"stmts":>7}'
+	)
+	for name, func in modes:
+		prefix = f'bulk-{uuid.uuid4().hex[:8]}'
+		rows = make_rows(prefix, args.rows)
+		async with sessionmanager.session() as session:
+			repo = ArticleRepository(session)
+			counts['statements'] = 0
+			started = time.perf_counter()
+			inserted = await func(repo, rows)
+			elapsed = time.perf_counter() - started
+			statements = counts['statements']
+
+		async with sessionmanager.session() as session:
+			await ArticleRepository(session).delete_many(
+				criteria=[Article.slug.like(f'{prefix}-%')]
+			)
+
+		print(
+			f'{name:<18} {inserted:>8} {elapsed:>8.2f} '
+			f'{inserted / elapsed:>9.0f} {statements:>7}'
+		)
+	await sessionmanager.close()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument('--rows', type=int, default=100000)
+	parser.add_argument('--batch-size', type=int, default=None)
+	parser.add_argument('--skip-orm', action='store_true')
+	args = parser.parse_args()
+	asyncio.run(main())
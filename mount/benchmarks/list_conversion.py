@@ -0,0 +1,128 @@
+"""
+Memory and time of converting a page of ORM rows to response models.
+
+Compares the original path (a model per row from `obj.__dict__.copy()`,
+dumped to JSON and parsed back to a dict), the same without the JSON round
+trip, and the batch `validate_list` conversion. Uses transient ORM
+objects, no database needed.
+
+	python benchmarks/list_conversion.py --rows 1000
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from app.models import Article, Category, Role, User
+from app.schemas.articles import ArticleResponse
+from app.schemas.categories import CategoryResponse
+from app.schemas.users import UserResponse
+from app.utils.helpers import validate_list
+
+
+def make_rows(count: int, content_chars: int) -> list[Article]:
+	role = Role(id=1, role='user')
+	author = User(
+		id=1,
+		username='author',
+		email='author@example.com',
+		full_name='Some Author',
+		is_active=True,
+		photo='',
+		role=role,
+	)
+	category = Category(id=1, name='Technology')
+	content = ('Lorem ipsum dolor sit amet. ' * content_chars)[:content_chars]
+	return [
+		Article(
+			id=i,
+			title=f'Article {i}',
+			slug=f'article-{i}',
+			content=content,
+			status='published',
+			tags=['python', 'fastapi'],
+			thumb_image='',
+			cover_image='',
+			author=author,
+			category=category,
+		)
+		for i in range(count)
+	]
+
+
+def legacy(rows: list[Article]) -> list[dict]:
+	return [json.loads(article.model_dump_json()) for article in per_row(rows)]
+
+
+def per_row(rows: list[Article]) -> list[ArticleResponse]:
+	return [
+		ArticleResponse(
+			id=article.id,
+			title=article.title,
+			slug=article.slug,
+			content=article.content,
+			status=article.status,
+			tags=article.tags,
+			thumb_image=article.thumb_image,
+			cover_image=article.cover_image,
+			author=UserResponse.model_validate(article.author.__dict__.copy()),
+			category=CategoryResponse.model_validate(
+				article.category.__dict__.copy()
+			),
+		)
+		for article in rows
+	]
+
+
+def batch(rows: list[Article]) -> list[ArticleResponse]:
+	return validate_list(ArticleResponse, rows)
+
+
+def measure(convert, rows) -> tuple[int, int]:
+	gc.collect()
+	tracemalloc.start()
+	before = tracemalloc.take_snapshot()
+	result = convert(rows)
+	after = tracemalloc.take_snapshot()
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+
+	# Blocks still allocated for the converted page
+	blocks = sum(
+		stat.count_diff for stat in after.compare_to(before, 'lineno')
+	)
+	del result
+	return peak, blocks
+
+
+def main(args):
+	rows = make_rows(args.rows, args.content_chars)
+	batch(rows)  # build the adapter outside the measurement
+	assert per_row(rows) == batch(rows)
+
+	print(f'{args.rows} rows')
+	print(f'{"":<10} {"time":>10} {"peak":>10} {"blocks":>8}')
+	for name, convert in (
+		('legacy', legacy),
+		('per row', per_row),
+		('batch', batch),
+	):
+		start = time.perf_counter()
+		for _ in range(args.number):
+			convert(rows)
+		elapsed = (time.perf_counter() - start) / args.number
+		peak, blocks = measure(convert, rows)
+		print(
+			f'{name:<10} {elapsed * 1000:8.2f}ms {peak / 1024:8.0f}KiB '
+			f'{blocks:>8}'
+		)
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument('--rows', type=int, default=1000)
+	parser.add_argument('--content-chars', type=int, default=2000)
+	parser.add_argument('--number', type=int, default=20)
+	main(parser.parse_args())
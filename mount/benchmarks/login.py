@@ -0,0 +1,99 @@
+"""
+Login throughput and tail latency under concurrency.
+
+Runs the app in-process against the configured database and fires
+`--requests` logins, `--concurrency` at a time. While the burst runs, a
+probe requests the health check every 10 ms: its latency shows how long
+the event loop is blocked for everybody else.
+
+	python benchmarks/login.py --identifier admin --password password1
+	python benchmarks/login.py --blocking  # bcrypt on the event loop
+
+`--blocking` restores the old behaviour for a before/after comparison.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.main import app
+from app.services.lifespan import lifespan
+from app.utils.password_utils import PasswordHasher
+
+
+def percentiles(samples: list[float]) -> str:
+	samples = sorted(samples)
+	pick = lambda p: samples[min(len(samples) - 1, int(len(samples) * p))]  # noqa: E731
+	return (
+		f'p50={pick(0.50) * 1000:.1f}ms p95={pick(0.95) * 1000:.1f}ms '
+		f'p99={pick(0.99) * 1000:.1f}ms max={samples[-1] * 1000:.1f}ms'
+	)
+
+
+async def blocking_verify(password: str, hashed_password: str) -> bool:
+	return PasswordHasher.verify_password(password, hashed_password)
+
+
+async def main(args):
+	if args.blocking:
+		PasswordHasher.averify_password = staticmethod(blocking_verify)
+
+	credentials = {'identifier': args.identifier, 'password': args.password}
+	semaphore = asyncio.Semaphore(args.concurrency)
+	done = asyncio.Event()
+
+	async with lifespan(app):
+		transport = httpx.ASGITransport(app=app)
+		async with httpx.AsyncClient(
+			transport=transport, base_url='http://bench'
+		) as client:
+
+			async def login() -> float:
+				async with semaphore:
+					start = time.perf_counter()
+					response = await client.post(
+						'/api/v1/users/login', json=credentials
+					)
+					response.raise_for_status()
+					return time.perf_counter() - start
+
+			async def probe() -> list[float]:
+				samples = []
+				while not done.is_set():
+					start = time.perf_counter()
+					await client.get('/')
+					samples.append(time.perf_counter() - start)
+					await asyncio.sleep(0.01)
+				return samples
+
+			await login()  # warm up the pool and the imports
+
+			probe_task = asyncio.create_task(probe())
+			start = time.perf_counter()
+			latencies = await asyncio.gather(
+				*(login() for _ in range(args.requests))
+			)
+			elapsed = time.perf_counter() - start
+			done.set()
+			probe_latencies = await probe_task
+
+	mode = 'blocking' if args.blocking else 'thread pool'
+	print(f'mode:        {mode}')
+	print(f'logins:      {args.requests} at concurrency {args.concurrency}')
+	print(f'throughput:  {args.requests / elapsed:.1f} logins/s')
+	print(f'login:       {percentiles(latencies)}')
+	print(f'probe:       {percentiles(probe_latencies)}')
+	print(f'probe mean:  {statistics.mean(probe_latencies) * 1000:.1f}ms')
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument('--requests', type=int, default=200)
+	parser.add_argument('--concurrency', type=int, default=20)
+	parser.add_argument('--identifier', default='admin')
+	parser.add_argument('--password', default='password1')
+	parser.add_argument('--blocking', action='store_true')
+	asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,118 @@
+"""
+Pool pressure under mixed slow and fast traffic: AI analysis requests
+whose LLM call takes `--llm-seconds` run next to plain article reads.
+
+	DB_POOL_SIZE=2 DB_MAX_OVERFLOW=0 python benchmarks/pool_pressure.py
+	python benchmarks/pool_pressure.py --slow 4 --fast 200 --llm-seconds 2
+
+The LLM is replaced by a sleep and every analysis misses the cache.
+Reports the latency of the fast reads and the peak of connections
+checked out and of checkouts waiting for one. Runs the app in-process
+against the configured database.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+from app.main import app
+from app.services import agent
+from app.services.connection import sessionmanager
+from app.services.lifespan import lifespan
+from app.usecases import agent_usecase
+from langchain_core.runnables import RunnableLambda
+
+
+async def fake_llm(_):
+	await asyncio.sleep(args.llm_seconds)
+	return 'Summary: benchmark'
+
+
+async def sample_pool(peaks: dict, stop: asyncio.Event):
+	while not stop.is_set():
+		stats = sessionmanager.pool_stats()
+		peaks['checked_out'] = max(peaks['checked_out'], stats['checked_out'])
+		peaks['waiters'] = max(peaks['waiters'], stats['waiters'])
+		await asyncio.sleep(0.005)
+
+
+async def main():
+	agent.chain = RunnableLambda(lambda _: '', afunc=fake_llm)
+	# Every analysis misses the caches and goes to the (fake) LLM
+	agent_usecase.analysis_hash = lambda _: uuid.uuid4().hex
+
+	async with lifespan(app):
+		transport = httpx.ASGITransport(app=app)
+		async with httpx.AsyncClient(
+			transport=transport, base_url='http://bench', timeout=60
+		) as client:
+			response = await client.post(
+				'/api/v1/users/login',
+				json={
+					'identifier': args.identifier,
+					'password': args.password,
+				},
+			)
+			token = response.json()['data']['access_token']
+			headers = {'Authorization': f'Bearer {token}'}
+			# Warms the principal cache
+			await client.get('/api/v1/users/auth', headers=headers)
+
+			peaks = {'checked_out': 0, 'waiters': 0}
+			stop = asyncio.Event()
+			sampler = asyncio.create_task(sample_pool(peaks, stop))
+
+			slow = [
+				asyncio.create_task(
+					client.get(
+						f'/api/v1/ai-agent/{args.article_id}',
+						headers=headers,
+					)
+				)
+				for _ in range(args.slow)
+			]
+			await asyncio.sleep(0.2)
+
+			timings = []
+			statuses = {}
+			for _ in range(args.fast):
+				started = time.perf_counter()
+				response = await client.get(
+					f'/api/v1/articles/{args.article_id}', headers=headers
+				)
+				timings.append((time.perf_counter() - started) * 1000)
+				statuses[response.status_code] = (
+					statuses.get(response.status_code, 0) + 1
+				)
+
+			slow_statuses = [
+				response.status_code
+				for response in await asyncio.gather(*slow)
+			]
+			stop.set()
+			await sampler
+
+	timings.sort()
+	print(f'slow requests     {args.slow} x {args.llm_seconds}s LLM')
+	print(f'slow statuses     {slow_statuses}')
+	print(f'fast requests     {args.fast} {statuses}')
+	print(f'fast p50          {statistics.median(timings):.2f} ms')
+	print(f'fast p95          {timings[int(len(timings) * 0.95) - 1]:.2f} ms')
+	print(f'fast max          {timings[-1]:.2f} ms')
+	print(f'peak checked out  {peaks["checked_out"]}')
+	print(f'peak waiters      {peaks["waiters"]}')
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument('--identifier', default='admin')
+	parser.add_argument('--password', default='password1')
+	parser.add_argument('--article-id', type=int, default=1)
+	parser.add_argument('--slow', type=int, default=4)
+	parser.add_argument('--fast', type=int, default=100)
+	parser.add_argument('--llm-seconds', type=float, default=2)
+	args = parser.parse_args()
+	asyncio.run(main())
@@ -0,0 +1,106 @@
+"""
+Rendering cost of an article search page.
+
+Compares the previous path (`model_dump_json` per article, `json.loads`
+back, then `JSONResponse` encoding the envelope again) with a single
+pydantic-core pass over the models.
+
+	python benchmarks/serialization.py --articles 20 --content-chars 5000
+"""
+
+import argparse
+import json
+import timeit
+
+from fastapi.responses import JSONResponse
+
+from app.schemas.articles import ArticleResponse
+from app.schemas.categories import CategoryResponse
+from app.schemas.roles import RoleResponse
+from app.schemas.users import UserResponse
+from app.utils.responses import standard_response
+
+
+def make_articles(count: int, content_chars: int) -> list[ArticleResponse]:
+	author = UserResponse(
+		id=1,
+		username='author',
+		email='author@example.com',
+		full_name='Some Author',
+		is_active=True,
+		photo='',
+		role=RoleResponse(role='user'),
+	)
+	category = CategoryResponse(id=1, name='Technology')
+	content = ('Lorem ipsum dolor sit amet, “quoted” text. ' * content_chars)[
+		:content_chars
+	]
+	return [
+		ArticleResponse(
+			id=i,
+			title=f'Article {i}',
+			slug=f'article-{i}',
+			content=content,
+			status='published',
+			tags=['python', 'fastapi', 'performance'],
+			thumb_image='',
+			cover_image='',
+			author=author,
+			category=category,
+		)
+		for i in range(count)
+	]
+
+
+def page(articles) -> dict:
+	return {
+		'total': len(articles),
+		'total_exact': True,
+		'next_cursor': None,
+		'prev_cursor': None,
+		'articles': articles,
+	}
+
+
+def legacy_render(articles: list[ArticleResponse]) -> bytes:
+	data = page(
+		[json.loads(article.model_dump_json()) for article in articles]
+	)
+	# The old standard_response: plain JSONResponse over the decoded dicts
+	return JSONResponse(
+		status_code=200,
+		content={'success': True, 'message': 'ok', 'data': data},
+	).body
+
+
+def single_pass_render(articles: list[ArticleResponse]) -> bytes:
+	return standard_response(200, True, 'ok', page(articles)).body
+
+
+def main(args):
+	articles = make_articles(args.articles, args.content_chars)
+	assert json.loads(legacy_render(articles)) == json.loads(
+		single_pass_render(articles)
+	)
+
+	print(
+		f'{args.articles} articles, {args.content_chars} content chars, '
+		f'{len(single_pass_render(articles))} response bytes'
+	)
+	for name, render in (
+		('legacy', legacy_render),
+		('single pass', single_pass_render),
+	):
+		runs = timeit.repeat(
+			lambda: render(articles), number=args.number, repeat=5
+		)
+		per_call = min(runs) / args.number * 1_000_000
+		print(f'{name:<12} {per_call:10.1f} us/page')
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument('--articles', type=int, default=20)
+	parser.add_argument('--content-chars', type=int, default=5000)
+	parser.add_argument('--number', type=int, default=200)
+	main(parser.parse_args())
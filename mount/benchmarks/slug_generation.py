@@ -0,0 +1,112 @@
+"""
+Picking a unique slug for a popular title: one lookup per taken
+`slug-N` (the old generate_unique_slug) against the single prefix query
+of BaseRepository.slug_usage.
+
+	python benchmarks/slug_generation.py --collisions 3000 --others 50000
+
+Loads `--collisions` articles titled like the benchmark title plus
+`--others` unrelated ones with COPY, runs both lookups and deletes the
+rows again. Runs against the configured database.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from app.models import Article
+from app.repositories.article_repo import ArticleRepository
+from app.services.config import config
+from app.services.connection import sessionmanager
+from app.utils.helpers import generate_unique_slug
+from slugify import slugify
+from sqlalchemy import event, or_, text
+
+
+async def one_by_one(name: str, repo: ArticleRepository) -> str:
+	# What generate_unique_slug used to do
+	slug_data = slugify(name)
+	slug_exists = await repo.get_by_field('slug', slug_data)
+	slug_count = 0
+	while slug_exists:
+		slug_count += 1
+		temp_slug_data = slug_data + '-' + str(slug_count)
+		temp_slug_exists = await repo.get_by_field('slug', temp_slug_data)
+		if not temp_slug_exists:
+			slug_data = temp_slug_data
+			break
+	return slug_data
+
+
+def row(slug: str) -> dict:
+	return {
+		'title': slug,
+		'slug': slug,
+		'content': 'benchmark',
+		'status': 'draft',
+		'author_id': 1,
+		'category_id': 1,
+	}
+
+
+async def main(args):
+	sessionmanager.init(config.db_dsn)
+	counts = {'statements': 0}
+
+	def on_statement(*_):
+		counts['statements'] += 1
+
+	event.listen(
+		sessionmanager._engine.sync_engine,
+		'before_cursor_execute',
+		on_statement,
+	)
+
+	title = f'Weekly roundup {uuid.uuid4().hex[:6]}'
+	slug = slugify(title)
+	noise = f'bench-{uuid.uuid4().hex[:6]}'
+	rows = [row(slug)]
+	rows += [row(f'{slug}-{i}') for i in range(1, args.collisions)]
+	rows += [row(f'{noise}-{i}') for i in range(args.others)]
+
+	async with sessionmanager.session() as session:
+		repo = ArticleRepository(session)
+		await repo.copy_all(rows)
+		await session.execute(text('ANALYZE articles'))
+		await session.commit()
+
+		print(f'{"method":<14} {"slug":<40} {"ms":>9} {"stmts":>7}')
+		for name, func in [
+			('one by one', one_by_one),
+			('prefix query', generate_unique_slug),
+		]:
+			counts['statements'] = 0
+			started = time.perf_counter()
+			picked = await func(title, repo)
+			elapsed = (time.perf_counter() - started) * 1000
+			print(
+				f'{name:<14} {picked:<40} {elapsed:>9.2f} '
+				f'{counts["statements"]:>7}'
+			)
+
+		if args.explain:
+			print(await repo.explain(repo.slug_usage_query(slug)))
+
+		await repo.delete_many(
+			criteria=[
+				or_(
+					Article.slug.startswith(slug),
+					Article.slug.startswith(noise),
+				)
+			]
+		)
+	await sessionmanager.close()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument('--collisions', type=int, default=3000)
+	parser.add_argument('--others', type=int, default=50000)
+	parser.add_argument('--explain', action='store_true')
+	asyncio.run(main(parser.parse_args()))